@@ -0,0 +1,94 @@
+"""
+A counter that increases with every write to the data the web interface serves.
+
+The web interface uses it as the ETag of its read endpoints, so a client that
+already has the current data gets a 304 after reading a single row.
+
+A session is marked as changed when a flush writes ORM objects or when it
+executes an INSERT, or an UPDATE or DELETE that affects rows (bulk inserts,
+upserts, archiving). The counter is then increased in the same transaction,
+right before it commits. Writes through a plain connection call
+bump_data_version() themselves.
+"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+data_version = Table(
+    'data_version',
+    MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('version', Integer, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+)
+
+# Databases known to have the table; until migrated, writes are not versioned
+_installed = set()
+
+
+def _has_table(connection):
+    url = str(connection.engine.url)
+    if url not in _installed and inspect(connection).has_table(data_version.name):
+        _installed.add(url)
+    return url in _installed
+
+
+def install_data_version(connection):
+    """Create the data_version table with its single row."""
+    data_version.create(connection, checkfirst=True)
+    if connection.execute(select(data_version.c.version)).first() is None:
+        connection.execute(insert(data_version).values(id=1, version=1, updated_at=datetime.now()))
+
+
+def get_data_version(connection):
+    """Current data version, 0 if there is none yet."""
+    return connection.execute(select(data_version.c.version).where(data_version.c.id == 1)).scalar() or 0
+
+
+def bump_data_version(connection):
+    """Increase the data version; part of the caller's transaction."""
+    if not _has_table(connection):
+        return
+    result = connection.execute(
+        update(data_version)
+        .where(data_version.c.id == 1)
+        .values(version=data_version.c.version + 1, updated_at=datetime.now())
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(data_version).values(id=1, version=1, updated_at=datetime.now()))
+
+
+def mark_changed(session):
+    """Record that the session wrote data, e.g. with a text() statement."""
+    session.info['data_changed'] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_flushed_changes(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        mark_changed(session)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_executed_changes(orm_execute_state):
+    if orm_execute_state.is_insert:
+        mark_changed(orm_execute_state.session)
+    elif orm_execute_state.is_update or orm_execute_state.is_delete:
+        # An UPDATE that matched nothing (e.g. archiving with nothing to archive) changes nothing
+        result = orm_execute_state.invoke_statement()
+        if getattr(result, 'rowcount', -1) != 0:
+            mark_changed(orm_execute_state.session)
+        return result
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_on_commit(session):
+    # Commit flushes after this hook, so flush first to see pending ORM changes
+    session.flush()
+    if session.info.pop('data_changed', False):
+        bump_data_version(session.connection())
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changes(session):
+    session.info.pop('data_changed', None)
@@ -1,46 +1,87 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from database.models import Base, Event, ParserMetadata, Tag, ParserTag, TagMapping
+from itertools import islice
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from database.dedup import DedupIndex, ensure_fingerprint
+from database.engine import get_engine, get_session_factory
+from database.event_dates import update_date_columns, update_next_dates, upcoming
+from database.migrations import migrate
+from database.models import Base, Event, EventDate, ParserMetadata, Tag, ParserTag, TagMapping, event_tags
 from datetime import datetime, timedelta
-from sqlalchemy.orm import joinedload
+from utils.config import INGEST_BATCH_SIZE, INGEST_MODE
 from utils.logger import logger
 
 
+def _row(obj, columns):
+    """Column values of an ORM object as a dict for a Core insert, applying scalar defaults."""
+    row = {}
+    for column in columns:
+        value = getattr(obj, column.key)
+        if value is None and column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        row[column.key] = value
+    return row
+
+
+def event_tag_ids(event):
+    """Ids of the tags assigned to an unsaved event (see BaseParser.apply_tags)."""
+    return set(getattr(event, '_tag_ids', ())) | {tag.id for tag in event.tags if tag.id is not None}
+
+
+def _event_columns():
+    return [column for column in Event.__table__.columns if not column.primary_key]
+
+
+# Dialects with INSERT ... ON CONFLICT support
+UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+def dialect_insert(bind, table):
+    """Dialect-specific insert construct of an engine or connection, offering on_conflict_do_update/do_nothing."""
+    return UPSERT_DIALECTS[bind.dialect.name](table)
+
+
 class DBManager:
     def __init__(self, db_url):
-        self.engine = create_engine(db_url)
-        self.Session = sessionmaker(bind=self.engine)
+        self.engine = get_engine(db_url)
+        self.Session = get_session_factory(db_url)
         self.session = self.Session()
+        # Loaded once per run by load_dedup_index()
+        self.dedup_index = None
 
     def create_tables(self):
-        """Recreate all tables for fresh start."""
+        """Create missing tables and bring existing ones up to date."""
         # Base.metadata.drop_all(self.engine)  # Drop existing tables
         Base.metadata.create_all(self.engine)  # Create fresh schema
+        migrate(self.engine)  # Add columns and indexes introduced since the tables were created
 
     def check_event_exists(self, title, event_date=None):
         """Check if an event with the same title and date exists in the database."""
         try:
+            query = self.session.query(Event.id).filter(Event.title == title)
             if event_date:
-                # Check for events with the same title and date
-                from sqlalchemy.orm import joinedload
-                event = self.session.query(Event).filter_by(title=title).options(joinedload(Event.dates)).first()
-
-                if event:
-                    # Check if any of the dates match
-                    for date in event.dates:
-                        if date.date.date() == event_date.date():
-                            return True
-                return False
-            else:
-                # Fall back to title-only check if no date provided
-                event = self.session.query(Event).filter_by(title=title).first()
-                if event:
-                    return True
-                return False
+                # Check for events with the same title on the same day
+                day_start = datetime(event_date.year, event_date.month, event_date.day)
+                query = query.join(EventDate, EventDate.event_id == Event.id).filter(
+                    EventDate.date >= day_start,
+                    EventDate.date < day_start + timedelta(days=1)
+                )
+            return query.first() is not None
         except Exception as e:
             print(f"Failed to check event existence: {e}")
             return False
 
+    def load_dedup_index(self):
+        """Load the in-memory index of known events used for duplicate detection during a run."""
+        self.dedup_index = DedupIndex.load(self.session)
+        logger.info(f"Loaded dedup index with {len(self.dedup_index)} known titles.")
+        return self.dedup_index
+
+    def is_new_event(self, event):
+        """Check whether an event should be stored, claiming it in the dedup index if so."""
+        if self.dedup_index is not None:
+            return self.dedup_index.add_if_new(event)
+        return not self.check_event_exists(event.title)
+
     def get_last_parsed_date(self, parser_name):
         """Retrieve the last parsed date for a parser."""
         metadata = self.session.query(ParserMetadata).filter_by(parser_name=parser_name).first()
@@ -57,18 +98,174 @@ class DBManager:
         self.session.commit()
 
     def add_event(self, event):
-        """Add a new event to the database if no matching title."""
-        if self.check_event_exists(event.title):
+        """Add a new event to the database unless it is a duplicate."""
+        if not self.is_new_event(event):
             print(f"Skipped duplicate event: {event.title}")
             return
+        ensure_fingerprint(event)
         self.session.add(event)
+        self.session.flush()
+        tag_ids = event_tag_ids(event) - {tag.id for tag in event.tags}
+        if tag_ids:
+            self.session.execute(insert(event_tags), [{'event_id': event.id, 'tag_id': tag_id} for tag_id in tag_ids])
+        self.refresh_event_dates([event.id])
         self.session.commit()
         logger.info(f"Added event: {event.title}")
 
-        # Log tags if any
-        if event.tags:
-            tag_names = [tag.name for tag in event.tags]
-            logger.info(f"Event tags: {', '.join(tag_names)}")
+    def upserts(self, mode=INGEST_MODE):
+        """Whether bulk_add_events upserts in this mode on this database (otherwise it skips known events)."""
+        return mode == 'upsert' and self.engine.dialect.name in UPSERT_DIALECTS
+
+    def bulk_add_events(self, events, batch_size=INGEST_BATCH_SIZE, mode=INGEST_MODE):
+        """
+        Store many events with bulk inserts, one transaction per batch.
+
+        Events, their dates and their tag links are written as multi-row inserts
+        per batch instead of flushing every object through the ORM. Tags must
+        already exist (see BaseParser.apply_tags).
+
+        In "upsert" mode events are written with INSERT ... ON CONFLICT on their
+        fingerprint, so the database merges duplicates: existing events are
+        updated and get any new dates. In "insert" mode duplicates are skipped
+        using the dedup index, which is loaded first if needed. Upserts need
+        SQLite or PostgreSQL; other databases fall back to "insert".
+
+        Args:
+            events: Iterable of unsaved Event objects
+            batch_size: Number of events per transaction
+            mode: "upsert" or "insert"
+
+        Returns:
+            Dict with the number of 'inserted' (in upsert mode: inserted or
+            updated) and 'skipped' events
+        """
+        upsert = self.upserts(mode)
+        if mode == 'upsert' and not upsert:
+            logger.warning(f"Upserts are not supported on {self.engine.dialect.name}; skipping duplicates instead.")
+        if not upsert and self.dedup_index is None:
+            self.load_dedup_index()
+
+        counts = {'inserted': 0, 'skipped': 0}
+        events = iter(events)
+        while True:
+            batch = list(islice(events, max(1, batch_size)))
+            if not batch:
+                break
+
+            for event in batch:
+                ensure_fingerprint(event)
+
+            try:
+                written = self._upsert_batch(batch) if upsert else self._insert_batch(batch)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                if not upsert:
+                    # The index claimed the rolled back events; reload it so they can be stored on a retry
+                    self.dedup_index = None
+                raise
+
+            counts['inserted'] += written
+            counts['skipped'] += len(batch) - written
+            logger.info(f"Stored batch of {written} events ({len(batch) - written} duplicates skipped).")
+
+        return counts
+
+    def _insert_batch(self, batch):
+        """Insert the events of a batch that are not in the dedup index."""
+        new_events = []
+        for event in batch:
+            if self.is_new_event(event):
+                new_events.append(event)
+            else:
+                print(f"Skipped duplicate event: {event.title}")
+        if not new_events:
+            return 0
+
+        table = Event.__table__
+        statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        event_ids = self.session.execute(
+            statement, [_row(event, _event_columns()) for event in new_events]
+        ).scalars().all()
+
+        self._insert_dates_and_tags([(event_id, [event]) for event_id, event in zip(event_ids, new_events)])
+        return len(new_events)
+
+    def _upsert_batch(self, batch):
+        """Insert or update the events of a batch in one statement, keyed on their fingerprint."""
+        # A statement may not touch the same row twice, so merge duplicates within the batch first
+        groups = {}
+        for event in batch:
+            groups.setdefault(event.fingerprint, []).append(event)
+
+        table = Event.__table__
+        statement = dialect_insert(self.engine, table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.fingerprint],
+            set_={
+                'title': statement.excluded.title,
+                'location': statement.excluded.location,
+                'url': statement.excluded.url,
+                'description': func.coalesce(statement.excluded.description, table.c.description),
+                'media_url': func.coalesce(statement.excluded.media_url, table.c.media_url),
+                # Listed again, so active until archive_events finds all its dates past
+                'archived': False,
+            },
+        ).returning(table.c.id, table.c.fingerprint)
+        rows = [_row(events[0], _event_columns()) for events in groups.values()]
+        event_ids = dict((fingerprint, event_id) for event_id, fingerprint in self.session.execute(statement, rows))
+
+        self._insert_dates_and_tags([(event_ids[fingerprint], events) for fingerprint, events in groups.items()],
+                                    merge=True)
+        if self.dedup_index is not None:
+            for event in batch:
+                self.dedup_index.add(event)
+        return len(groups)
+
+    def _insert_dates_and_tags(self, stored, merge=False):
+        """
+        Write the dates and tag links of stored events.
+
+        Args:
+            stored: List of (event_id, events) tuples; all events of a tuple share the row
+            merge: Skip dates and tag links the events already have in the database
+        """
+        existing_dates = set()
+        if merge and stored:
+            existing_dates = set(self.session.execute(
+                select(EventDate.event_id, EventDate.date, EventDate.end_date)
+                .where(EventDate.event_id.in_([event_id for event_id, _ in stored]))
+            ).tuples())
+
+        date_columns = [column for column in EventDate.__table__.columns
+                        if not column.primary_key and column.key != 'event_id']
+        date_rows = []
+        tag_rows = []
+        for event_id, events in stored:
+            tag_ids = set()
+            for event in events:
+                for event_date in event.dates:
+                    key = (event_id, event_date.date, event_date.end_date)
+                    if key not in existing_dates:
+                        existing_dates.add(key)
+                        date_rows.append(dict(_row(event_date, date_columns), event_id=event_id))
+                tag_ids.update(event_tag_ids(event))
+            tag_rows.extend({'event_id': event_id, 'tag_id': tag_id} for tag_id in tag_ids)
+
+        if date_rows:
+            self.session.execute(insert(EventDate.__table__), date_rows)
+        if tag_rows:
+            if merge:
+                statement = dialect_insert(self.engine, event_tags).on_conflict_do_nothing()
+            else:
+                statement = insert(event_tags)
+            self.session.execute(statement, tag_rows)
+
+        self.refresh_event_dates([event_id for event_id, _ in stored])
+
+    def refresh_event_dates(self, event_ids=None):
+        """Recompute first_date, next_date and last_date of the given events (all if None) after their dates changed."""
+        self.session.execute(update_date_columns(event_ids))
 
     def archive_event(self, event_id):
         """Mark an event as archived."""
@@ -86,33 +283,36 @@ class DBManager:
             self.session.rollback()
             return False
 
-    def archive_events(self):
-        """Archive events where all associated dates are in the past."""
-        try:
-            # Find events where all associated dates are in the past
-            now = datetime.now()
-
-            events_to_archive = (
-                self.session.query(Event)
-                .options(joinedload(Event.dates))
-                .filter(Event.archived == False)
-                .all()
-            )
+    def archive_events(self, now=None):
+        """
+        Archive events where all associated dates are in the past.
 
-            count = 0
-            for event in events_to_archive:
-                # Check if all associated dates are in the past
-                if all((event_date.end_date if event_date.end_date else event_date.date) < now for event_date in event.dates):
-                    event.archived = True
-                    count += 1
+        Runs as a single UPDATE with a correlated NOT EXISTS on event_dates, so
+        no events are loaded into Python.
 
+        Returns:
+            Number of archived events, or None on failure
+        """
+        try:
+            now = now or datetime.now()
+            upcoming_date = select(EventDate.id).where(EventDate.event_id == Event.id, upcoming(now))
+            result = self.session.execute(
+                update(Event)
+                .where(Event.archived == False, ~exists(upcoming_date))
+                .values(archived=True)
+                .execution_options(synchronize_session=False)
+            )
+            # Occurrences that started since the last run no longer count as next date
+            self.session.execute(update_next_dates(now))
             self.session.commit()
+
+            count = result.rowcount
             logger.info(f"{count} events archived.")
-            return True
+            return count
         except Exception as e:
             print(f"Failed to archive events: {e}")
             self.session.rollback()
-            return False
+            return None
 
     def get_all_events(self):
         """Retrieve all events from the database."""
@@ -0,0 +1,117 @@
+import hashlib
+import re
+import threading
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from database.models import Event, EventDate
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Query parameters that only track where a visitor came from
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def _day(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def normalize_title(title):
+    """Normalize a title for duplicate detection (case and whitespace insensitive)."""
+    return _WHITESPACE_RE.sub(" ", title or "").strip().casefold()
+
+
+def canonical_url(url):
+    """Normalize an event URL: lowercase scheme and host, no fragment, tracking parameters or trailing slash."""
+    parts = urlsplit((url or "").strip())
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith(_TRACKING_PARAMS))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def event_fingerprint(title, url):
+    """
+    Stable identity of an event: hash of normalized title, venue and canonical URL.
+
+    The venue is the host serving the event page, so the same title at two
+    venues never collides.
+    """
+    url = canonical_url(url)
+    venue = urlsplit(url).netloc
+    key = "\x1f".join((normalize_title(title), venue, url))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def ensure_fingerprint(event):
+    """Set the fingerprint of an event that does not have one yet and return it."""
+    if not event.fingerprint:
+        event.fingerprint = event_fingerprint(event.title, event.url)
+    return event.fingerprint
+
+
+class DedupIndex:
+    """
+    In-memory index of known events, loaded once per run.
+
+    An event counts as known when its fingerprint or URL is known, or when its
+    normalized title is known on one of its dates (on any date if the event has none).
+    """
+
+    def __init__(self):
+        self._titles = set()
+        self._title_dates = set()
+        self._urls = set()
+        self._fingerprints = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, session):
+        """Build the index from the database with a single projection query."""
+        index = cls()
+        rows = session.query(Event.title, Event.url, Event.fingerprint, EventDate.date) \
+            .outerjoin(EventDate, EventDate.event_id == Event.id)
+        for title, url, fingerprint, date in rows:
+            index._add_keys(normalize_title(title), url, fingerprint, [_day(date)] if date else [])
+        return index
+
+    def __len__(self):
+        return len(self._titles)
+
+    @staticmethod
+    def _keys(event):
+        dates = [_day(event_date.date) for event_date in event.dates if event_date.date]
+        return normalize_title(event.title), event.url, ensure_fingerprint(event), dates
+
+    def _contains_keys(self, title, url, fingerprint, dates):
+        if (url and url in self._urls) or fingerprint in self._fingerprints:
+            return True
+        if not dates:
+            return title in self._titles
+        return any((title, date) in self._title_dates for date in dates)
+
+    def _add_keys(self, title, url, fingerprint, dates):
+        self._titles.add(title)
+        if url:
+            self._urls.add(url)
+        if fingerprint:
+            self._fingerprints.add(fingerprint)
+        for date in dates:
+            self._title_dates.add((title, date))
+
+    def contains(self, event):
+        """Check whether an event is already known."""
+        return self._contains_keys(*self._keys(event))
+
+    def add(self, event):
+        """Record an accepted event."""
+        with self._lock:
+            self._add_keys(*self._keys(event))
+
+    def add_if_new(self, event):
+        """Record an event unless it is already known. Returns True if it was new."""
+        keys = self._keys(event)
+        with self._lock:
+            if self._contains_keys(*keys):
+                return False
+            self._add_keys(*keys)
+            return True
@@ -0,0 +1,69 @@
+"""
+One engine and session factory per database URL for the whole process.
+
+The parsers, the web interface and the scripts all get their engine here, so a
+run shares a single connection pool. SQLite connections are tuned on connect:
+WAL lets the web interface read while a parser run is writing, and the busy
+timeout makes writers wait for each other instead of failing with
+"database is locked".
+"""
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+import database.data_version  # Registers the session hooks that version every write
+from utils.config import (DATABASE_URL, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_SIZE,
+                          SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE)
+
+_engines = {}
+_session_factories = {}
+_lock = threading.Lock()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL: a crash can lose the last transactions, not corrupt the database
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    finally:
+        cursor.close()
+
+
+def _create_engine(db_url):
+    url = make_url(db_url)
+    if url.get_backend_name() == "sqlite":
+        engine = create_engine(url, connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000})
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,  # Replace connections the server closed while idle
+    )
+
+
+def get_engine(db_url=DATABASE_URL):
+    """Get the shared engine for a database URL, creating it on first use."""
+    with _lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            engine = _engines[db_url] = _create_engine(db_url)
+        return engine
+
+
+def get_session_factory(db_url=DATABASE_URL):
+    """Get the shared session factory for a database URL."""
+    engine = get_engine(db_url)
+    with _lock:
+        factory = _session_factories.get(db_url)
+        if factory is None:
+            factory = _session_factories[db_url] = sessionmaker(bind=engine)
+        return factory
@@ -0,0 +1,51 @@
+"""
+Statements maintaining the denormalized date columns of events.
+
+first_date is the earliest start, last_date the latest end (or start when an
+occurrence has no end) and next_date the start of the earliest occurrence that
+has not ended yet. They let the event list sort and filter on dates without
+joining event_dates.
+"""
+from datetime import datetime
+from sqlalchemy import and_, func, or_, select, update
+from database.models import Event, EventDate
+
+
+def upcoming(now):
+    """Condition on EventDate: the occurrence has not ended at the given time."""
+    return or_(EventDate.end_date >= now, and_(EventDate.end_date.is_(None), EventDate.date >= now))
+
+
+def _next_date(now):
+    return select(func.min(EventDate.date)) \
+        .where(EventDate.event_id == Event.id, upcoming(now)) \
+        .scalar_subquery()
+
+
+def update_date_columns(event_ids=None, now=None):
+    """UPDATE statement recomputing all date columns, for the given events or all of them."""
+    now = now or datetime.now()
+    first_date = select(func.min(EventDate.date)).where(EventDate.event_id == Event.id).scalar_subquery()
+    last_date = select(func.max(func.coalesce(EventDate.end_date, EventDate.date))) \
+        .where(EventDate.event_id == Event.id) \
+        .scalar_subquery()
+
+    statement = update(Event).values(first_date=first_date, next_date=_next_date(now), last_date=last_date)
+    if event_ids is not None:
+        statement = statement.where(Event.id.in_(event_ids))
+    return statement.execution_options(synchronize_session=False)
+
+
+def update_next_dates(now=None):
+    """
+    UPDATE statement moving next_date forward for events whose next occurrence has started.
+
+    Events with an occurrence that is still running keep it as next date, so
+    only rows whose value changes are updated.
+    """
+    now = now or datetime.now()
+    next_date = _next_date(now)
+    return update(Event) \
+        .where(Event.next_date < now, Event.next_date.is_distinct_from(next_date)) \
+        .values(next_date=next_date) \
+        .execution_options(synchronize_session=False)
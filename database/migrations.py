@@ -0,0 +1,218 @@
+"""
+Versioned schema migrations for existing databases.
+
+create_all() only creates missing tables, so new columns and indexes never
+reach a database that already exists. Each migration below runs once, in
+order, in its own transaction, and is recorded in the schema_version table.
+Migrations are written to be idempotent (they check what already exists),
+so they are also safe on a database that create_all() just created.
+"""
+from datetime import date, datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, case, func, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+from database.data_version import install_data_version
+from database.dedup import event_fingerprint
+from database.event_dates import update_date_columns
+from database.search import install_search_index
+from database.models import (Event, EventDate, ParserHealth, ParserHealthDaily, ParserStatus, TagMapping,
+                             event_tags)
+from utils.logger import logger
+
+schema_version = Table(
+    'schema_version',
+    MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('description', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def add_column(connection, table, column_name):
+    """Add a column of a model table to the database unless it already exists."""
+    existing = [column['name'] for column in inspect(connection).get_columns(table.name)]
+    if column_name in existing:
+        return False
+
+    column_ddl = CreateColumn(table.c[column_name]).compile(dialect=connection.dialect)
+    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+    logger.info(f"Added column {table.name}.{column_name}")
+    return True
+
+
+def create_index(connection, table, index_name):
+    """Create an index declared on a model table unless it already exists."""
+    index = next(index for index in table.indexes if index.name == index_name)
+    existing = [index['name'] for index in inspect(connection).get_indexes(table.name)]
+    if index_name in existing:
+        return False
+
+    index.create(connection)
+    logger.info(f"Created index {index_name}")
+    return True
+
+
+def _add_parser_health_cache_columns(connection):
+    add_column(connection, ParserHealth.__table__, 'cache_hits')
+    add_column(connection, ParserHealth.__table__, 'cache_misses')
+
+
+def _add_event_fingerprints(connection):
+    add_column(connection, Event.__table__, 'fingerprint')
+
+    # Fill in fingerprints; events that share one are merged into the oldest, keeping all dates and tags.
+    # Fingerprints that are already set (by ingest, or by the former scripts/add_event_fingerprints.py) are kept.
+    kept = {}
+    merged = 0
+    rows = connection.execute(select(Event.id, Event.title, Event.url, Event.fingerprint).order_by(Event.id)).all()
+    for event_id, title, url, current in rows:
+        fingerprint = current or event_fingerprint(title, url)
+        if fingerprint not in kept:
+            kept[fingerprint] = event_id
+            if current is None:
+                connection.execute(Event.__table__.update().where(Event.id == event_id)
+                                   .values(fingerprint=fingerprint))
+            continue
+
+        target_id = kept[fingerprint]
+        connection.execute(EventDate.__table__.update().where(EventDate.event_id == event_id)
+                           .values(event_id=target_id))
+        target_tags = select(event_tags.c.tag_id).where(event_tags.c.event_id == target_id)
+        connection.execute(event_tags.update()
+                           .where(event_tags.c.event_id == event_id, event_tags.c.tag_id.not_in(target_tags))
+                           .values(event_id=target_id))
+        connection.execute(event_tags.delete().where(event_tags.c.event_id == event_id))
+        connection.execute(Event.__table__.delete().where(Event.id == event_id))
+        merged += 1
+
+    if merged:
+        logger.info(f"Merged {merged} duplicate events")
+    create_index(connection, Event.__table__, 'ix_events_fingerprint')
+
+
+def _add_query_indexes(connection):
+    create_index(connection, Event.__table__, 'ix_events_title')
+    create_index(connection, Event.__table__, 'ix_events_archived')
+    create_index(connection, EventDate.__table__, 'ix_event_dates_event_id')
+    create_index(connection, EventDate.__table__, 'ix_event_dates_date')
+    create_index(connection, EventDate.__table__, 'ix_event_dates_end_date')
+    create_index(connection, event_tags, 'ix_event_tags_tag_id')
+    create_index(connection, ParserHealth.__table__, 'ix_parser_health_parser_name_last_run')
+    create_index(connection, TagMapping.__table__, 'ix_tag_mappings_display_tag')
+
+
+def _add_event_date_columns(connection):
+    for column_name in ('first_date', 'next_date', 'last_date'):
+        add_column(connection, Event.__table__, column_name)
+        create_index(connection, Event.__table__, f'ix_events_{column_name}')
+    connection.execute(update_date_columns())
+
+
+def _add_parser_health_rollups(connection):
+    add_column(connection, ParserHealth.__table__, 'duration_seconds')
+    ParserStatus.__table__.create(connection, checkfirst=True)
+    ParserHealthDaily.__table__.create(connection, checkfirst=True)
+
+    # Latest status per parser from the raw history
+    latest = select(ParserHealth.parser_name, func.max(ParserHealth.last_run).label('last_run')) \
+        .group_by(ParserHealth.parser_name).subquery()
+    last_success = select(ParserHealth.parser_name, func.max(ParserHealth.last_run).label('last_run')) \
+        .where(ParserHealth.success == True).group_by(ParserHealth.parser_name).subquery()
+    rows = connection.execute(
+        select(ParserHealth, last_success.c.last_run.label('last_success'))
+        .join(latest, (latest.c.parser_name == ParserHealth.parser_name) & (latest.c.last_run == ParserHealth.last_run))
+        .outerjoin(last_success, last_success.c.parser_name == ParserHealth.parser_name)
+    ).mappings().all()
+    status_rows = {}
+    for row in rows:
+        status_rows[row['parser_name']] = {column.key: row[column.key] for column in ParserStatus.__table__.columns}
+    if status_rows and not connection.execute(select(func.count()).select_from(ParserStatus.__table__)).scalar():
+        connection.execute(ParserStatus.__table__.insert(), list(status_rows.values()))
+
+    # Daily rollups of the raw history
+    day = func.date(ParserHealth.last_run)
+    rollups = connection.execute(
+        select(ParserHealth.parser_name, day, func.count(),
+               func.sum(case((ParserHealth.success == True, 0), else_=1)),
+               func.sum(func.coalesce(ParserHealth.events_parsed, 0)))
+        .group_by(ParserHealth.parser_name, day)
+    ).all()
+    if rollups and not connection.execute(select(func.count()).select_from(ParserHealthDaily.__table__)).scalar():
+        connection.execute(ParserHealthDaily.__table__.insert(), [{
+            'parser_name': parser_name,
+            'day': value if isinstance(value, date) else date.fromisoformat(value),
+            'runs': runs,
+            'failures': failures,
+            'events_parsed': events_parsed,
+            'duration_seconds': 0,
+        } for parser_name, value, runs, failures, events_parsed in rollups])
+
+
+def _add_parser_health_timed_runs(connection):
+    table = ParserHealthDaily.__table__
+    if not add_column(connection, table, 'timed_runs'):
+        return
+
+    # Count the timed runs that are still in the raw history; older days keep 0 (no average)
+    day = func.date(ParserHealth.last_run)
+    rows = connection.execute(
+        select(ParserHealth.parser_name, day, func.count(), func.sum(ParserHealth.duration_seconds))
+        .where(ParserHealth.duration_seconds.isnot(None))
+        .group_by(ParserHealth.parser_name, day)
+    ).all()
+    for parser_name, value, timed_runs, duration_seconds in rows:
+        connection.execute(
+            table.update()
+            .where(table.c.parser_name == parser_name,
+                   table.c.day == (value if isinstance(value, date) else date.fromisoformat(value)))
+            .values(timed_runs=timed_runs, duration_seconds=duration_seconds)
+        )
+
+
+def _add_active_event_sort_indexes(connection):
+    for column_name in ('title', 'first_date', 'next_date', 'last_date'):
+        create_index(connection, Event.__table__, f'ix_events_archived_{column_name}')
+
+
+# (version, description, function); append new migrations at the end, never renumber
+MIGRATIONS = [
+    (1, "Add cache counters to parser_health", _add_parser_health_cache_columns),
+    (2, "Add unique event fingerprints", _add_event_fingerprints),
+    (3, "Add indexes for dedup, filtering, archiving and parser health", _add_query_indexes),
+    (4, "Add first, next and last date columns to events", _add_event_date_columns),
+    (5, "Add latest parser status and daily parser health rollups", _add_parser_health_rollups),
+    (6, "Add full-text search index on events", install_search_index),
+    (7, "Add data version counter", install_data_version),
+    (8, "Count the runs with a duration in the daily parser health rollups", _add_parser_health_timed_runs),
+    (9, "Add indexes for sorting active events", _add_active_event_sort_indexes),
+]
+
+
+def get_schema_version(connection):
+    """Highest applied migration version, 0 for a database without migrations."""
+    schema_version.create(connection, checkfirst=True)
+    return connection.execute(select(schema_version.c.version).order_by(schema_version.c.version.desc())).scalar() or 0
+
+
+def migrate(engine):
+    """
+    Apply all pending migrations.
+
+    Returns:
+        List of applied migration versions
+    """
+    with engine.begin() as connection:
+        current = get_schema_version(connection)
+
+    applied = []
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+
+        logger.info(f"Applying migration {version}: {description}")
+        with engine.begin() as connection:
+            migration(connection)
+            connection.execute(schema_version.insert().values(
+                version=version, description=description, applied_at=datetime.now()))
+        applied.append(version)
+
+    return applied
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, Float, Text, ForeignKey, Table, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -9,7 +9,9 @@ event_tags = Table(
     'event_tags',
     Base.metadata,
     Column('event_id', Integer, ForeignKey('events.id', ondelete='CASCADE'), primary_key=True),
-    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key covers lookups by event; the tag filter needs its own index
+    Index('ix_event_tags_tag_id', 'tag_id')
 )
 
 class ParserMetadata(Base):
@@ -24,12 +26,18 @@ class Event(Base):
     __tablename__ = 'events'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    title = Column(String(255), nullable=False)
+    title = Column(String(255), nullable=False, index=True)
     description = Column(String(1000), nullable=True)
     location = Column(String(255), nullable=False)
     url = Column(String(500), nullable=False)
     media_url = Column(String(500), nullable=True)
-    archived = Column(Boolean, default=False)
+    archived = Column(Boolean, default=False, index=True)
+    # Hash of normalized title, venue and canonical URL (see database.dedup.event_fingerprint)
+    fingerprint = Column(String(64), nullable=True, unique=True, index=True)
+    # Summary of the event dates for sorting and filtering (see database.event_dates)
+    first_date = Column(DateTime, nullable=True, index=True)
+    next_date = Column(DateTime, nullable=True, index=True)
+    last_date = Column(DateTime, nullable=True, index=True)
 
     # Relationship to event dates
     dates = relationship('EventDate', back_populates='event', cascade="all, delete-orphan")
@@ -37,15 +45,23 @@ class Event(Base):
     # Relationship to tags (many-to-many)
     tags = relationship('Tag', secondary=event_tags, back_populates='events')
 
+    # Pages of the active events in the web interface, read in (sort column, id) order
+    __table_args__ = (
+        Index('ix_events_archived_title', 'archived', 'title', 'id'),
+        Index('ix_events_archived_first_date', 'archived', 'first_date', 'id'),
+        Index('ix_events_archived_next_date', 'archived', 'next_date', 'id'),
+        Index('ix_events_archived_last_date', 'archived', 'last_date', 'id'),
+    )
+
 
 class EventDate(Base):
     __tablename__ = 'event_dates'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    event_id = Column(Integer, ForeignKey('events.id', ondelete='CASCADE'))
-    date = Column(DateTime, nullable=False)  # Exact date or start of interval
+    event_id = Column(Integer, ForeignKey('events.id', ondelete='CASCADE'), index=True)
+    date = Column(DateTime, nullable=False, index=True)  # Exact date or start of interval
     time = Column(String(20), nullable=True)  # Optional time for the date
-    end_date = Column(DateTime, nullable=True)  # For intervals
+    end_date = Column(DateTime, nullable=True, index=True)  # For intervals
     end_time = Column(String(20), nullable=True)  # Optional end time for intervals
 
     event = relationship('Event', back_populates='dates')
@@ -61,6 +77,48 @@ class ParserHealth(Base):
     success = Column(Boolean, default=True)
     events_parsed = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)
+    cache_hits = Column(Integer, default=0)  # Pages skipped because they did not change
+    cache_misses = Column(Integer, default=0)  # Pages that had to be parsed
+    duration_seconds = Column(Float, nullable=True)
+
+    # Latest run per parser
+    __table_args__ = (
+        Index('ix_parser_health_parser_name_last_run', 'parser_name', 'last_run'),
+    )
+
+
+class ParserStatus(Base):
+    """Latest run of each parser, one row per parser (see database.parser_health)."""
+    __tablename__ = 'parser_status'
+
+    parser_name = Column(String(255), primary_key=True)
+    display_name = Column(String(255), nullable=True)
+    last_run = Column(DateTime, nullable=False)
+    last_success = Column(DateTime, nullable=True)  # Last run that succeeded
+    success = Column(Boolean, default=True)
+    events_parsed = Column(Integer, default=0)
+    error_message = Column(Text, nullable=True)
+    cache_hits = Column(Integer, default=0)
+    cache_misses = Column(Integer, default=0)
+    duration_seconds = Column(Float, nullable=True)
+
+
+class ParserHealthDaily(Base):
+    """Runs of a parser per day, kept after the raw ParserHealth rows are pruned."""
+    __tablename__ = 'parser_health_daily'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    parser_name = Column(String(255), nullable=False)
+    day = Column(Date, nullable=False)
+    runs = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
+    events_parsed = Column(Integer, nullable=False, default=0)  # Total; divide by runs for the average
+    duration_seconds = Column(Float, nullable=False, default=0)  # Total of the runs that recorded one
+    timed_runs = Column(Integer, nullable=False, default=0, server_default='0')  # Runs that recorded a duration
+
+    __table_args__ = (
+        UniqueConstraint('parser_name', 'day', name='uq_parser_health_daily_parser_name_day'),
+    )
 
 
 class Tag(Base):
@@ -98,4 +156,4 @@ class TagMapping(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     source_tag = Column(String(100), nullable=False, unique=True)  # Original tag name from parser
-    display_tag = Column(String(100), nullable=False)  # Consolidated display name
\ No newline at end of file
+    display_tag = Column(String(100), nullable=False, index=True)  # Consolidated display name
\ No newline at end of file
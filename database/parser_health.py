@@ -0,0 +1,128 @@
+"""
+Parser health bookkeeping.
+
+Every run appends a raw ParserHealth row, upserts the parser's ParserStatus row
+(what the health endpoint shows) and adds itself to the ParserHealthDaily
+rollup of its day. Raw rows older than the retention period are pruned, so
+neither the endpoint nor the table grow with the age of the installation.
+"""
+from datetime import datetime, timedelta
+from database.db_manager import UPSERT_DIALECTS, dialect_insert
+from database.models import ParserHealth, ParserHealthDaily, ParserStatus
+from utils.config import PARSER_HEALTH_RETENTION_DAYS
+
+
+def record_run(session, parser_name, display_name, success, events_parsed, error_message=None,
+               cache_hits=0, cache_misses=0, duration_seconds=None, now=None,
+               retention_days=PARSER_HEALTH_RETENTION_DAYS):
+    """
+    Record a parser run in the raw history, the latest status and the daily rollup.
+
+    The caller commits the session.
+    """
+    now = now or datetime.now()
+    status = {
+        'parser_name': parser_name,
+        'display_name': display_name,
+        'last_run': now,
+        'success': success,
+        'events_parsed': events_parsed,
+        'error_message': error_message,
+        'cache_hits': cache_hits,
+        'cache_misses': cache_misses,
+        'duration_seconds': duration_seconds,
+    }
+    session.add(ParserHealth(**status))
+
+    bind = session.get_bind()
+    if bind.dialect.name in UPSERT_DIALECTS:
+        _upsert_status(session, bind, status, now)
+        _upsert_daily(session, bind, parser_name, now.date(), success, events_parsed, duration_seconds)
+    else:
+        _merge_status(session, status, now)
+        _merge_daily(session, parser_name, now.date(), success, events_parsed, duration_seconds)
+
+    if retention_days:
+        session.query(ParserHealth) \
+            .filter(ParserHealth.parser_name == parser_name,
+                    ParserHealth.last_run < now - timedelta(days=retention_days)) \
+            .delete(synchronize_session=False)
+
+
+def _upsert_status(session, bind, status, now):
+    table = ParserStatus.__table__
+    values = dict(status, last_success=now if status['success'] else None)
+    updates = {key: value for key, value in values.items() if key != 'parser_name'}
+    if not status['success']:
+        # Keep the time of the last successful run
+        del updates['last_success']
+    statement = dialect_insert(bind, table).values(**values) \
+        .on_conflict_do_update(index_elements=[table.c.parser_name], set_=updates)
+    session.execute(statement)
+
+
+def _upsert_daily(session, bind, parser_name, day, success, events_parsed, duration_seconds):
+    table = ParserHealthDaily.__table__
+    failures = 0 if success else 1
+    timed_runs = 0 if duration_seconds is None else 1
+    duration_seconds = duration_seconds or 0
+    statement = dialect_insert(bind, table).values(
+        parser_name=parser_name, day=day, runs=1, failures=failures,
+        events_parsed=events_parsed, duration_seconds=duration_seconds, timed_runs=timed_runs,
+    ).on_conflict_do_update(
+        index_elements=[table.c.parser_name, table.c.day],
+        set_={
+            'runs': table.c.runs + 1,
+            'failures': table.c.failures + failures,
+            'events_parsed': table.c.events_parsed + events_parsed,
+            'duration_seconds': table.c.duration_seconds + duration_seconds,
+            'timed_runs': table.c.timed_runs + timed_runs,
+        },
+    )
+    session.execute(statement)
+
+
+def _merge_status(session, status, now):
+    record = session.get(ParserStatus, status['parser_name'])
+    if record is None:
+        record = ParserStatus(parser_name=status['parser_name'])
+        session.add(record)
+    for key, value in status.items():
+        setattr(record, key, value)
+    if status['success']:
+        record.last_success = now
+
+
+def _merge_daily(session, parser_name, day, success, events_parsed, duration_seconds):
+    rollup = session.query(ParserHealthDaily).filter_by(parser_name=parser_name, day=day).first()
+    if rollup is None:
+        rollup = ParserHealthDaily(parser_name=parser_name, day=day, runs=0, failures=0,
+                                   events_parsed=0, duration_seconds=0, timed_runs=0)
+        session.add(rollup)
+    rollup.runs += 1
+    rollup.failures += 0 if success else 1
+    rollup.events_parsed += events_parsed
+    rollup.duration_seconds += duration_seconds or 0
+    rollup.timed_runs += 0 if duration_seconds is None else 1
+
+
+def daily_summaries(session, days=30, parser_name=None):
+    """
+    Daily runs, failures, average events and average duration per parser for the last days.
+
+    The average duration only covers runs that recorded one; it is None for
+    days without any (e.g. rolled up from history that had no durations).
+    """
+    query = session.query(ParserHealthDaily) \
+        .filter(ParserHealthDaily.day >= datetime.now().date() - timedelta(days=days))
+    if parser_name:
+        query = query.filter(ParserHealthDaily.parser_name == parser_name)
+
+    return [{
+        'parser_name': rollup.parser_name,
+        'day': rollup.day.isoformat(),
+        'runs': rollup.runs,
+        'failures': rollup.failures,
+        'avg_events': rollup.events_parsed / rollup.runs if rollup.runs else 0,
+        'avg_duration_seconds': rollup.duration_seconds / rollup.timed_runs if rollup.timed_runs else None,
+    } for rollup in query.order_by(ParserHealthDaily.day, ParserHealthDaily.parser_name)]
@@ -0,0 +1,154 @@
+"""
+Full-text search over event titles, descriptions and locations.
+
+SQLite uses an FTS5 table (events_fts) that triggers keep in sync with events;
+PostgreSQL uses a generated tsvector column with a GIN index. Both fold
+diacritics ("café" finds "Cafe") and match word prefixes, so search-as-you-type
+works. Databases without either fall back to ILIKE.
+"""
+import re
+from sqlalchemy import Float, Integer, func, inspect, literal_column, or_, text
+from database.models import Event
+from utils.logger import logger
+
+_SQLITE_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    title, description, location,
+    content='events', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)
+"""
+
+_SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF title, description, location ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO events_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+]
+
+_POSTGRES_SEARCH = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() is not IMMUTABLE, which generated columns and indexes require
+    """
+    CREATE OR REPLACE FUNCTION events_unaccent(text) RETURNS text AS
+    $$ SELECT public.unaccent('public.unaccent', $1) $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    """,
+    """
+    ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', events_unaccent(coalesce(title, ''))), 'A') ||
+        setweight(to_tsvector('simple', events_unaccent(coalesce(location, ''))), 'B') ||
+        setweight(to_tsvector('simple', events_unaccent(coalesce(description, ''))), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)",
+]
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def install_search_index(connection):
+    """Create the full-text index for the connection's dialect. Returns False if it is not available."""
+    dialect = connection.dialect.name
+    try:
+        with connection.begin_nested():
+            if dialect == 'sqlite':
+                connection.execute(text(_SQLITE_FTS))
+                for trigger in _SQLITE_TRIGGERS:
+                    connection.execute(text(trigger))
+                connection.execute(text("INSERT INTO events_fts(events_fts) VALUES ('rebuild')"))
+            elif dialect == 'postgresql':
+                for statement in _POSTGRES_SEARCH:
+                    connection.execute(text(statement))
+            else:
+                return False
+    except Exception as e:
+        logger.warning(f"Full-text search is not available, falling back to ILIKE: {e}")
+        return False
+    return True
+
+
+def drop_search_index(connection):
+    """Remove the full-text index, e.g. before the events table is recreated."""
+    if connection.dialect.name == 'sqlite':
+        for trigger in ('events_fts_insert', 'events_fts_delete', 'events_fts_update'):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        connection.execute(text("DROP TABLE IF EXISTS events_fts"))
+    elif connection.dialect.name == 'postgresql':
+        connection.execute(text("ALTER TABLE IF EXISTS events DROP COLUMN IF EXISTS search_vector"))
+
+
+def search_backend(connection):
+    """The full-text backend installed in the database ('fts5', 'tsvector') or None."""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'")).first()
+        return 'fts5' if exists else None
+    if dialect == 'postgresql':
+        columns = [column['name'] for column in inspect(connection).get_columns('events')]
+        return 'tsvector' if 'search_vector' in columns else None
+    return None
+
+
+def _words(search_text):
+    return _WORD_RE.findall(search_text.lower())
+
+
+def apply_search(query, backend, search_text):
+    """
+    Filter a query of events on search text.
+
+    Every word must match, either completely or as the start of a longer word.
+
+    Returns:
+        (query, rank) where rank is a column to order by for relevance (lower
+        is better) or None when falling back to ILIKE
+    """
+    words = _words(search_text)
+    if not words:
+        # Only punctuation: nothing for the full-text index to match, so match it literally like ILIKE does
+        backend = None
+
+    if backend == 'fts5':
+        # Quote each word so it is never read as an FTS operator
+        match = " ".join(f'"{word}"*' for word in words)
+        # Title matches weigh most, then location, then description
+        matches = text(
+            "SELECT rowid AS event_id, bm25(events_fts, 10.0, 1.0, 5.0) AS rank "
+            "FROM events_fts WHERE events_fts MATCH :match"
+        ).bindparams(match=match).columns(event_id=Integer, rank=Float).subquery('search')
+        query = query.join(matches, matches.c.event_id == Event.id)
+        return query, matches.c.rank
+
+    if backend == 'tsvector':
+        ts_query = func.to_tsquery('simple', func.events_unaccent(" & ".join(f"{word}:*" for word in words)))
+        search_vector = literal_column('events.search_vector')
+        query = query.filter(search_vector.op('@@')(ts_query))
+        # ts_rank is higher for better matches
+        return query, -func.ts_rank(search_vector, ts_query)
+
+    pattern = f'%{search_text}%'
+    query = query.filter(
+        or_(
+            Event.title.ilike(pattern),
+            Event.description.ilike(pattern),
+            Event.location.ilike(pattern)
+        )
+    )
+    return query, None
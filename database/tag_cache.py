@@ -0,0 +1,53 @@
+from sqlalchemy import event as sa_event, insert, select
+from database.db_manager import UPSERT_DIALECTS, dialect_insert
+from database.models import ParserTag, Tag
+
+
+class TagCache:
+    """
+    Tag ids by name for one session, loaded with a single query.
+
+    Missing tags are created with one insert per call instead of a query and a
+    flush per tag. The cache lives in session.info and is dropped when the
+    session rolls back, since tags it created may then no longer exist.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._ids = dict(session.execute(select(Tag.name, Tag.id)).all())
+        self._parser_tags = set(session.execute(select(ParserTag.parser_name, ParserTag.tag_id)).all())
+
+    @classmethod
+    def for_session(cls, session):
+        """Get the cache of a session, creating it on first use."""
+        cache = session.info.get('tag_cache')
+        if cache is None:
+            cache = session.info['tag_cache'] = cls(session)
+            sa_event.listen(session, 'after_rollback', _drop_tag_cache, once=True)
+        return cache
+
+    def get_ids(self, names):
+        """Map tag names to ids, creating missing tags in a single insert."""
+        missing = {name for name in names if name not in self._ids}
+        if missing:
+            bind = self.session.get_bind()
+            if bind.dialect.name in UPSERT_DIALECTS:
+                # Another session may create the same tag concurrently
+                statement = dialect_insert(bind, Tag.__table__).on_conflict_do_nothing()
+            else:
+                statement = insert(Tag.__table__)
+            self.session.execute(statement, [{'name': name} for name in sorted(missing)])
+            self._ids.update(self.session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+        return {name: self._ids[name] for name in names}
+
+    def ensure_parser_tags(self, parser_name, tag_ids):
+        """Associate tags with a parser, skipping associations that already exist."""
+        missing = {tag_id for tag_id in tag_ids if (parser_name, tag_id) not in self._parser_tags}
+        if missing:
+            self.session.execute(insert(ParserTag.__table__),
+                                 [{'parser_name': parser_name, 'tag_id': tag_id} for tag_id in sorted(missing)])
+            self._parser_tags.update((parser_name, tag_id) for tag_id in missing)
+
+
+def _drop_tag_cache(session):
+    session.info.pop('tag_cache', None)
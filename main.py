@@ -1,4 +1,5 @@
 import argparse
+from parsers.event_pipeline import EventPipeline
 from parsers.parser_manager import ParserManager
 from database.db_manager import DBManager
 from utils.config import DATABASE_URL
@@ -9,6 +10,13 @@ def main():
     # CLI Argument Parsing
     parser = argparse.ArgumentParser(description="Run parsers to fetch events.")
     parser.add_argument("--parser", nargs="+", help="Specific parsers to run. Leave empty to run all.")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of parsers to run concurrently (default: 1).")
+    parser.add_argument("--stream", action="store_true",
+                        help="Store events in batches while parsing instead of after all parsers finished.")
+    parser.add_argument("--full", action="store_true",
+                        help="Crawl every page instead of stopping once pages only contain known events.")
+    parser.add_argument("--no-archive", action="store_true",
+                        help="Skip archiving past events, e.g. when scripts/archive_events.py runs separately.")
     args = parser.parse_args()
 
     # Initialize database manager
@@ -16,29 +24,48 @@ def main():
     db_manager.create_tables()
 
     # Archive events older than today
-    db_manager.archive_events()
+    if not args.no_archive:
+        db_manager.archive_events()
+
+    # Upserts update known events, so parsers hand them on instead of dropping them
+    upsert = db_manager.upserts()
+
+    # Load known events once instead of querying the database for every parsed event. With upserts
+    # they are only needed to stop paginating on incremental crawls.
+    dedup_index = None if upsert and args.full else db_manager.load_dedup_index()
 
     # Initialize parser manager with database session
-    parser_manager = ParserManager(db_manager.session)
+    parser_manager = ParserManager(db_manager.session, session_factory=db_manager.Session,
+                                   full_crawl=args.full, dedup_index=dedup_index, update_known_events=upsert)
     parser_manager.auto_register_parsers()
 
+    if args.stream:
+        # Stream events into the database as they are parsed
+        pipeline = EventPipeline(db_manager)
+        parser_names = args.parser or parser_manager.get_parser_names()
+        logger.info(f"Streaming parsers: {', '.join(parser_names)}")
+        parser_manager.stream_parsers(parser_names, pipeline, max_workers=args.jobs)
+
+        logger.info(f"Inserted {pipeline.inserted} events into the database ({pipeline.skipped} duplicates skipped).")
+        db_manager.close()
+        return
+
     if args.parser:
         # Run specific parsers
-        all_events = []
-        for parser_name in args.parser:
-            logger.info(f"Running specific parser: {parser_name}")
-            events = parser_manager.run_specific_parser(parser_name)
-            all_events.extend(events)
+        logger.info(f"Running specific parsers: {', '.join(args.parser)}")
+        all_events = parser_manager.run_parsers(args.parser, max_workers=args.jobs)
     else:
         # Run all parsers
         logger.info("Running all parsers...")
-        all_events = parser_manager.run_all_parsers()
+        all_events = parser_manager.run_all_parsers(max_workers=args.jobs)
+
+    # Insert events into the database in batches
+    counts = db_manager.bulk_add_events(all_events)
 
-    # Insert events into the database
-    for event in all_events:
-        db_manager.add_event(event)
+    # Only now may the fetched pages count as seen
+    parser_manager.commit_http_caches()
 
-    logger.info(f"Inserted {len(all_events)} events into the database.")
+    logger.info(f"Inserted {counts['inserted']} events into the database ({counts['skipped']} duplicates skipped).")
     db_manager.close()
 
 
@@ -1,9 +1,21 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
+import hashlib
+import importlib.util
 import traceback
-from database.models import ParserHealth, Tag, ParserTag
+from bs4 import BeautifulSoup, SoupStrainer
+from database.dedup import DedupIndex
+from database.models import ParserMetadata
+from database.parser_health import record_run
+from database.tag_cache import TagCache
+from utils.config import INCREMENTAL_STOP_PAGES, PARSER_BACKEND
+from utils.http_client import HttpClient
+from utils.page_fetcher import PageFetcher
 from utils.logger import logger
 
+# lxml builds trees several times faster than the pure Python html.parser
+DEFAULT_PARSER_BACKEND = PARSER_BACKEND or ("lxml" if importlib.util.find_spec("lxml") else "html.parser")
+
 
 class BaseParser(ABC):
     # Add display_name class variable with default value
@@ -12,6 +24,27 @@ class BaseParser(ABC):
     # Add automatic_tags class variable for venue-specific tags
     automatic_tags = []  # List of tag names to automatically apply to all events
 
+    # BeautifulSoup tree builder used by find_event_items
+    parser_backend = DEFAULT_PARSER_BACKEND
+
+    # Force a complete crawl instead of stopping at already known pages
+    full_crawl = False
+
+    # Stop paginating after this many consecutive pages with only known events
+    incremental_stop_pages = INCREMENTAL_STOP_PAGES
+
+    # Whether the current run is incremental; set at the start of each run
+    incremental = False
+    _known_only_pages = 0
+
+    # Index of known events shared by all parsers of a run (see DBManager.load_dedup_index)
+    dedup_index = None
+    # Whether dedup_index was loaded by the parser itself, and so belongs to a single run
+    _owns_dedup_index = False
+
+    # Hand known events on to be upserted (updating them and adding new dates) instead of dropping them
+    update_known_events = False
+
     @classmethod
     def get_automatic_tags(cls):
         """Get the list of automatic tags for this parser."""
@@ -22,6 +55,106 @@ class BaseParser(ABC):
         """Get the name of the parser class."""
         return cls.__name__
 
+    @property
+    def http(self):
+        """Pooled HTTP client that keeps connections alive for the whole crawl."""
+        client = self.__dict__.get('_http')
+        if client is None:
+            client = self.__dict__['_http'] = HttpClient()
+        return client
+
+    def find_event_items(self, markup, name, class_):
+        """
+        Parse a page and return its event card elements.
+
+        Only the matching elements and their subtrees are built, so the rest of a
+        large agenda page (navigation, footer, scripts) is never turned into a tree.
+        """
+        # While parsing, the strainer sees the raw class attribute, so compare class tokens
+        wanted = set(class_.split())
+        strainer = SoupStrainer(name, class_=lambda value: bool(value) and wanted.issubset(value.split()))
+        soup = BeautifulSoup(markup, self.parser_backend, parse_only=strainer)
+        return soup.find_all(name, class_=class_)
+
+    def is_unchanged(self, response):
+        """Check whether a fetched page is identical to the one seen on the previous run."""
+        return not self.full_crawl and getattr(response, 'unchanged', False)
+
+    def iter_pages(self, build_request, start=1, stop=None, fan_out=True):
+        """
+        Fetch pages concurrently and yield (page, response) tuples in page order.
+
+        Paginated parsers can opt into this instead of fetching page by page. Pass
+        stop when the number of pages is known to fan them all out (unless fan_out
+        is False); otherwise pages are prefetched a few at a time until the caller
+        stops iterating.
+        """
+        return PageFetcher(self.http).iter_pages(build_request, start=start, stop=stop, fan_out=fan_out)
+
+    def is_known_event(self, event):
+        """Check whether a parsed event is already in the database or was parsed earlier in this run."""
+        return self.dedup_index is not None and self.dedup_index.contains(event)
+
+    def skip_known_event(self, event):
+        """
+        Check whether a parsed event should be dropped because it is already known.
+
+        With update_known_events (upsert ingest) known events are kept, so the
+        database updates them and merges in new dates; callers still count them
+        as known when deciding to stop paginating.
+        """
+        if not self.is_known_event(event):
+            return False
+        event_date = event.dates[0].date if event.dates else None
+        if self.update_known_events:
+            print(f"Event already exists: {event.title} on {event_date}. Updating it.")
+            return False
+        print(f"Event already exists: {event.title} on {event_date}.")
+        return True
+
+    def should_stop_paging(self, page_keys, new_events):
+        """
+        Record a crawled page and decide whether pagination should stop.
+
+        Args:
+            page_keys: Strings identifying the page content, e.g. the event URLs on it
+            new_events: Number of events on the page that were not known yet
+
+        Stops when a page repeats an earlier one (always, to guard against sites
+        that keep serving the last page) or, on incremental runs, once
+        incremental_stop_pages consecutive pages contained only known events.
+        """
+        fingerprints = self.__dict__.setdefault('_page_fingerprints', set())
+        fingerprint = hashlib.sha1("\n".join(page_keys).encode("utf-8")).hexdigest()
+        if fingerprint in fingerprints:
+            print("Page repeats an earlier page. Stopping pagination.")
+            return True
+        fingerprints.add(fingerprint)
+
+        self._known_only_pages = 0 if new_events else self._known_only_pages + 1
+        if self.incremental and self.incremental_stop_pages and self._known_only_pages >= self.incremental_stop_pages:
+            print(f"No new events on the last {self._known_only_pages} pages. Stopping pagination.")
+            return True
+        return False
+
+    def _begin_run(self, db_session):
+        """Reset per-run crawl state; runs are incremental once a previous run was recorded."""
+        self._page_fingerprints = set()
+        self._run_started = datetime.now()
+        self._known_only_pages = 0
+        last_parsed_date = db_session.query(ParserMetadata.last_parsed_date) \
+            .filter_by(parser_name=self.get_parser_name()).scalar()
+        self.incremental = not self.full_crawl and last_parsed_date is not None
+        if self._owns_dedup_index:
+            # Reload every run; the last one may be stale or hold events that were never stored
+            self.dedup_index = None
+            self._owns_dedup_index = False
+        if self.dedup_index is None and not (self.full_crawl and self.update_known_events):
+            # Running on its own, outside ParserManager; only needed to drop known events or stop paginating
+            self.dedup_index = DedupIndex.load(db_session)
+            self._owns_dedup_index = True
+        return self._run_started
+
     @abstractmethod
     def fetch_data(self):
         """Fetch all data from the target source."""
@@ -32,52 +165,61 @@ class BaseParser(ABC):
         """Parse a single event item and return a structured object."""
         pass
 
+    def iter_events(self):
+        """Yield events as they are parsed. Parsers that paginate override this to yield per page."""
+        yield from self.fetch_data() or []
+
     def apply_automatic_tags(self, event, db_session):
         """Apply automatic venue tags to the event."""
         if not self.automatic_tags:
             return
 
-        for tag_name in self.automatic_tags:
-            # Get or create the tag
-            tag = db_session.query(Tag).filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db_session.add(tag)
-                db_session.flush()  # Flush to get the tag ID
+        tag_cache = TagCache.for_session(db_session)
+        tag_ids = tag_cache.get_ids(self.automatic_tags).values()
 
-                # Associate tag with parser for future reference
-                parser_tag = ParserTag(parser_name=self.get_parser_name(), tag_id=tag.id)
-                db_session.add(parser_tag)
+        # Associate tags with parser for future reference
+        tag_cache.ensure_parser_tags(self.get_parser_name(), tag_ids)
 
-            # Add tag to the event if not already present
-            if tag not in event.tags:
-                event.tags.append(tag)
+        self._add_tag_ids(event, tag_ids)
 
     def apply_event_specific_tags(self, event, db_session):
         """Apply event-specific tags that were extracted during parsing."""
         # Check if the event has tag names attached from the parser
         if hasattr(event, '_tag_names') and event._tag_names:
-            for tag_name in event._tag_names:
-                # Get or create the tag
-                tag = db_session.query(Tag).filter_by(name=tag_name).first()
-                if not tag:
-                    tag = Tag(name=tag_name)
-                    db_session.add(tag)
-                    db_session.flush()
-
-                # Add tag to the event if not already present
-                if tag not in event.tags:
-                    event.tags.append(tag)
+            tag_ids = TagCache.for_session(db_session).get_ids(event._tag_names).values()
+            self._add_tag_ids(event, tag_ids)
 
             # Clean up the temporary attribute
             delattr(event, '_tag_names')
 
-    def run_with_error_handling(self, db_session):
+    @staticmethod
+    def _add_tag_ids(event, tag_ids):
+        # Tag links are written together with the event (see DBManager.bulk_add_events)
+        event._tag_ids = getattr(event, '_tag_ids', set()) | set(tag_ids)
+
+    def apply_tags(self, events, db_session):
+        """Apply automatic and event-specific tags to a list of events."""
+        # Create all missing tags of the batch at once; the per-event calls below then only hit the cache
+        tag_names = set(self.automatic_tags)
+        for event in events:
+            tag_names.update(getattr(event, '_tag_names', None) or ())
+        TagCache.for_session(db_session).get_ids(tag_names)
+
+        for event in events:
+            # Apply automatic venue tags
+            self.apply_automatic_tags(event, db_session)
+
+            # Apply event-specific tags if any were extracted
+            self.apply_event_specific_tags(event, db_session)
+
+    def run_with_error_handling(self, db_session, apply_tags=True):
         """
         Run the parser with error handling and health logging.
 
         Args:
             db_session: Database session to use for logging health status
+            apply_tags: Tag the events in db_session. Concurrent runs disable this
+                and tag the merged results in a single session afterwards.
 
         Returns:
             List of parsed events or empty list on failure
@@ -89,15 +231,12 @@ class BaseParser(ABC):
 
         try:
             logger.info(f"Running parser: {parser_name}")
+            started = self._begin_run(db_session)
             events = self.fetch_data()
 
             # Apply automatic tags to all events
-            for event in events:
-                # Apply automatic venue tags
-                self.apply_automatic_tags(event, db_session)
-
-                # Apply event-specific tags if any were extracted
-                self.apply_event_specific_tags(event, db_session)
+            if apply_tags:
+                self.apply_tags(events, db_session)
 
             logger.info(f"Parser {parser_name} completed successfully. Found {len(events)} events.")
         except Exception as e:
@@ -107,21 +246,110 @@ class BaseParser(ABC):
             logger.error(f"Parser {parser_name} failed with error: {e}")
             logger.error(f"Stack trace: {stack_trace}")
 
-        # Log parser health
-        health_record = ParserHealth(
-            parser_name=parser_name,
-            display_name=self.display_name,  # Add display_name to the health record
-            last_run=datetime.now(),
-            success=success,
-            events_parsed=len(events),
-            error_message=error_message
-        )
+        self._log_health(db_session, success, len(events), error_message, started if success else None)
+        return events
+
+    def stream_with_error_handling(self, db_session, pipeline):
+        """
+        Run the parser in streaming mode with error handling and health logging.
+
+        Events are handed to the pipeline as soon as they are parsed, which tags,
+        deduplicates and stores them in batches.
+
+        Args:
+            db_session: Database session to use for logging health status
+            pipeline: EventPipeline receiving the events
+
+        Returns:
+            Number of events handed to the pipeline
+        """
+        parser_name = self.__class__.__name__
+        events_parsed = 0
+        success = True
+        error_message = None
+
+        try:
+            logger.info(f"Streaming parser: {parser_name}")
+            started = self._begin_run(db_session)
+            for event in self.iter_events():
+                pipeline.add(self, event)
+                events_parsed += 1
+            pipeline.flush(self)
+            # All events of this run are stored now
+            self.commit_http_cache()
+
+            logger.info(f"Parser {parser_name} completed successfully. Streamed {events_parsed} events.")
+        except Exception as e:
+            success = False
+            error_message = str(e)
+            stack_trace = traceback.format_exc()
+            logger.error(f"Parser {parser_name} failed with error: {e}")
+            logger.error(f"Stack trace: {stack_trace}")
+
+        self._log_health(db_session, success, events_parsed, error_message, started if success else None)
+        return events_parsed
+
+    def _log_health(self, db_session, success, events_parsed, error_message, parsed_until=None):
+        """Record this run's parser health and advance the high-water mark on success."""
+        http_stats = self._finish_http_cache(success)
+
+        now = datetime.now()
+        started = self.__dict__.get('_run_started')
 
         try:
-            db_session.add(health_record)
+            # Log parser health
+            record_run(
+                db_session,
+                parser_name=self.__class__.__name__,
+                display_name=self.display_name,
+                success=success,
+                events_parsed=events_parsed,
+                error_message=error_message,
+                cache_hits=http_stats.get('cache_hits', 0),
+                cache_misses=http_stats.get('cache_misses', 0),
+                duration_seconds=(now - started).total_seconds() if started else None,
+                now=now,
+            )
+            if parsed_until:
+                self._record_high_water_mark(db_session, parsed_until)
             db_session.commit()
         except Exception as e:
             logger.error(f"Failed to log parser health: {e}")
             db_session.rollback()
 
-        return events
\ No newline at end of file
+    def _record_high_water_mark(self, db_session, parsed_until):
+        """Remember when this parser last completed a crawl."""
+        metadata = db_session.query(ParserMetadata).filter_by(parser_name=self.get_parser_name()).first()
+        if not metadata:
+            metadata = ParserMetadata(parser_name=self.get_parser_name())
+            db_session.add(metadata)
+        metadata.last_parsed_date = parsed_until
+
+    def commit_http_cache(self):
+        """
+        Write the pages fetched by the last successful run to the HTTP cache.
+
+        Call this only once the run's events are stored: from then on the pages
+        count as seen and unchanged ones are skipped on the next run.
+        """
+        client = self.__dict__.get('_http')
+        if client is None or not client.cache:
+            return
+        try:
+            client.cache.flush()
+        except OSError as e:
+            logger.error(f"Failed to write HTTP cache for {self.get_parser_name()}: {e}")
+
+    def _finish_http_cache(self, success):
+        """Forget the pages of a failed run and return the HTTP counters."""
+        client = self.__dict__.get('_http')
+        if client is None:
+            return {}
+
+        if client.cache and not success:
+            client.cache.discard()
+
+        stats = client.stats
+        client.reset_stats()
+        logger.info(f"Parser {self.get_parser_name()} HTTP stats: {stats}")
+        return stats
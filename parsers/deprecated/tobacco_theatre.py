@@ -1,10 +1,7 @@
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from database.models import Event, EventDate
 from parsers.base_parser import BaseParser
-from database.db_manager import DBManager
-from utils.config import DATABASE_URL
 import json
 
 class TobaccoTheatreParser(BaseParser):
@@ -13,13 +10,10 @@ class TobaccoTheatreParser(BaseParser):
     # Add human-readable display name
     display_name = "Tobacco Theatre"
 
-    def __init__(self):
-        self.db_manager = DBManager(DATABASE_URL)
-
     def fetch_data(self):
         """Fetch all events"""
         events = []
-        response = requests.get(self.BASE_URL)
+        response = self.http.get(self.BASE_URL)
 
         if response.status_code == 200:
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -33,7 +27,7 @@ class TobaccoTheatreParser(BaseParser):
 
                     if event:
                         # Check if the event already exists
-                        if self.db_manager.check_event_exists(event.title):
+                        if self.is_known_event(event):
                             print(f"Event already exists: {event.title}. Stopping parser.")
                             return events  # Stop parsing
                         events.append(event)
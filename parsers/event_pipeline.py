@@ -0,0 +1,69 @@
+import threading
+from collections import defaultdict
+from utils.config import INGEST_BATCH_SIZE
+
+
+class EventPipeline:
+    """
+    Tags, deduplicates and stores events in bounded batches as parsers yield them.
+
+    All writes go through the DBManager's session using its bulk insert path. Parsers running in worker
+    threads may call add() concurrently; batches are processed one at a time. Every parser has its own
+    buffer, so a batch that fails to store only affects the parser that produced it. A failed batch is
+    kept at the front of its buffer and written again by the next flush.
+    """
+
+    def __init__(self, db_manager, batch_size=INGEST_BATCH_SIZE):
+        self.db_manager = db_manager
+        self.session = db_manager.session
+        self.batch_size = max(1, batch_size)
+        self.inserted = 0
+        self.skipped = 0
+        self._buffers = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add(self, parser, event):
+        """Queue an event from a parser, writing the parser's batch once enough are queued."""
+        with self._lock:
+            self._buffers[parser].append(event)
+            if len(self._buffers[parser]) >= self.batch_size:
+                self._flush_buffer(parser)
+
+    def flush(self, parser=None):
+        """
+        Write the queued events of a parser, or of all parsers.
+
+        When flushing all parsers, a failure does not stop the other parsers'
+        events from being written; the first error is raised afterwards.
+        """
+        with self._lock:
+            if parser is not None:
+                self._flush_buffer(parser)
+                return
+
+            error = None
+            for queued_parser in list(self._buffers):
+                try:
+                    self._flush_buffer(queued_parser)
+                except Exception as e:
+                    error = error or e
+            if error is not None:
+                raise error
+
+    def _flush_buffer(self, parser):
+        events = self._buffers.pop(parser, None)
+        if not events:
+            return
+
+        try:
+            # Tag the batch in the pipeline's session
+            parser.apply_tags(events, self.session)
+            counts = self.db_manager.bulk_add_events(events, batch_size=len(events))
+        except Exception:
+            self.session.rollback()
+            # Keep the batch for the next flush, ahead of anything queued since
+            self._buffers[parser][:0] = events
+            raise
+
+        self.inserted += counts['inserted']
+        self.skipped += counts['skipped']
@@ -1,10 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+from contextlib import closing
 from database.models import Event, EventDate
 from parsers.base_parser import BaseParser
-from database.db_manager import DBManager
-from utils.config import DATABASE_URL
+from utils.dutch_dates import parse_dutch_date, parse_dutch_date_range
 import re
 
 
@@ -30,83 +27,6 @@ def _parse_media_url(item):
     return None
 
 
-def _parse_date(date_str):
-    """Parse Dutch date format into a Python datetime object."""
-    if not date_str:
-        raise ValueError("Empty date string")
-
-    # Translate Dutch abbreviations to English
-    date_str = date_str.replace('’', "").replace('\u2019', "")  # Normalize apostrophes
-
-    # Translate Dutch abbreviations to English
-    translations = {
-        "ma": "Mon", "di": "Tue", "wo": "Wed", "do": "Thu", "vr": "Fri", "za": "Sat", "zo": "Sun",
-        "jan": "Jan", "feb": "Feb", "mrt": "Mar", "apr": "Apr", "mei": "May", "jun": "Jun",
-        "jul": "Jul", "aug": "Aug", "sep": "Sep", "okt": "Oct", "nov": "Nov", "dec": "Dec"
-    }
-
-    # Split the input string into parts
-    parts = date_str.split()
-    translated_parts = []
-
-    for part in parts:
-        # Check if this part is a Dutch day or month abbreviation
-        part_lower = part.lower()
-        found = False
-        for dutch, english in translations.items():
-            if part_lower == dutch:
-                translated_parts.append(english)
-                found = True
-                break
-        if not found:
-            translated_parts.append(part)
-
-    # Rejoin the parts
-    translated = " ".join(translated_parts)
-
-    # Try to parse with just a few simple formats after cleaning
-    formats_to_try = [
-        "%a %d %b %y",  # "Mon 11 Mar 25" (two-digit year, no apostrophe)
-        "%a %d %b %Y",  # "Mon 11 Mar 2025" (four-digit year)
-        "%d %b %y",     # "11 Mar 25" (no weekday)
-        "%d %b %Y",     # "11 Mar 2025" (no weekday, four-digit year)
-        "%a %d %b",     # "Mon 11 Mar" (no year - will default to 1900)
-        "%d %b"         # "11 Mar" (no weekday, no year)
-    ]
-
-    # Try each format until one works
-    for fmt in formats_to_try:
-        try:
-            return datetime.strptime(translated, fmt)
-        except ValueError:
-            continue
-
-    # If all standard formats fail, try a manual approach for specific cases
-    parts = translated.split()
-    if len(parts) >= 3:
-        try:
-            # Check if the last part might be a year
-            if len(parts[-1]) <= 2 and parts[-1].isdigit():
-                # Handle 2-digit year
-                year = 2000 + int(parts[-1])  # Assume 21st century
-                # Try to parse month and day
-                month_names = {
-                    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-                }
-
-                for i, part in enumerate(parts[:-1]):
-                    if part in month_names and i > 0 and parts[i-1].isdigit():
-                        day = int(parts[i-1])
-                        month = month_names[part]
-                        return datetime(year, month, day)
-        except (ValueError, IndexError):
-            pass
-
-    # If all else fails, raise an error with detailed information
-    raise ValueError(f"Could not parse date: '{date_str}' (translated to '{translated}')")
-
-
 def _parse_dates(datetime_section):
     """Extract all dates and times from the datetime section."""
     dates = []
@@ -117,7 +37,6 @@ def _parse_dates(datetime_section):
         raise ValueError("Missing start date element")
 
     start_date_raw = start_element.get_text(strip=True)
-    start_date = _parse_date(start_date_raw)
 
     # Check for separator (indicating multiple dates or a date range)
     separator = datetime_section.find('div', class_='separator')
@@ -128,22 +47,16 @@ def _parse_dates(datetime_section):
         if not end_element:
             raise ValueError("Missing end date element in a multi-date event")
 
-        end_date_raw = end_element.get_text(strip=True)
-        end_date = _parse_date(end_date_raw)
-
-        # Handle multiple single dates (separated by "en")
-        if separator_text == "en":
-            dates.append(EventDate(date=start_date))
-            dates.append(EventDate(date=end_date))
+        # Multiple single dates are separated by "en", a date range by "-"
+        if separator_text not in ("en", "-"):
+            raise ValueError(f"Unknown separator type: {separator_text}")
 
-        # Handle date range (separated by "-")
-        elif separator_text == "-":
+        end_date_raw = end_element.get_text(strip=True)
+        for start_date, end_date in parse_dutch_date_range(f"{start_date_raw} {separator_text} {end_date_raw}"):
             dates.append(EventDate(date=start_date, end_date=end_date))
-
-        else:
-            raise ValueError(f"Unknown separator type: {separator_text}")
     else:
         # Handle single date (possibly with time)
+        start_date = parse_dutch_date(start_date_raw)
         time_element = datetime_section.find('span', class_='start')
         time = time_element.get_text(strip=True) if time_element else None
         dates.append(EventDate(date=start_date, time=time))
@@ -186,47 +99,55 @@ class FrascatiParser(BaseParser):
     # Set automatic tags for all events from this venue
     automatic_tags = ["Amsterdam"]
 
-    def __init__(self):
-        self.db_manager = DBManager(DATABASE_URL)
-
     def fetch_data(self):
         """Fetch all event pages and parse event details."""
-        page = 1
-        events = []
+        return list(self.iter_events())
+
+    def iter_events(self):
+        """Yield new events page by page."""
+        # Pages are prefetched a few ahead; iteration stops at the first empty page
+        with closing(self.iter_pages(self._page_request)) as pages:
+            for page, response in pages:
+                print(f"Fetched page {page}...")
 
-        while True:
-            print(f"Fetching page {page}...")
-            url = f"{self.BASE_URL}{self.PAGINATION_PARAM}{page}"
-            response = requests.get(url)
+                if response.status_code != 200:
+                    print(f"Failed to fetch page {page}. Status code: {response.status_code}")
+                    break
 
-            if response.status_code != 200:
-                print(f"Failed to fetch page {page}. Status code: {response.status_code}")
-                break
+                # An unchanged page was fully handled on a previous run
+                if self.is_unchanged(response) and 'eventCard' in response.text:
+                    print(f"Page {page} unchanged since last run. Skipping.")
+                    if self.should_stop_paging([response.text], new_events=0):
+                        break
+                    continue
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            event_items = soup.find_all('li', class_='eventCard')
+                event_items = self.find_event_items(response.text, 'li', 'eventCard')
 
-            if not event_items:
-                print("No more events found. Stopping pagination.")
-                break
+                if not event_items:
+                    print("No more events found. Stopping pagination.")
+                    break
 
-            for item in event_items:
-                event = self.parse_event(item)
+                page_keys = []
+                new_events = 0
+                for item in event_items:
+                    event = self.parse_event(item)
 
-                if event:
-                    # Get the event date (assuming the first date in the list)
-                    event_date = event.dates[0].date if event.dates else None
+                    if event:
+                        page_keys.append(f"{event.url}|{event.title}")
 
-                    # Check if the event already exists
-                    if self.db_manager.check_event_exists(event.title, event_date):
-                        print(f"Event already exists: {event.title} on {event_date}.")
-                        continue
+                        if not self.is_known_event(event):
+                            new_events += 1
+                        elif self.skip_known_event(event):
+                            continue
 
-                    events.append(event)
+                        yield event
 
-            page += 1
+                if self.should_stop_paging(page_keys, new_events):
+                    break
 
-        return events
+    def _page_request(self, page):
+        """Build the request for an agenda page."""
+        return f"{self.BASE_URL}{self.PAGINATION_PARAM}{page}", None
 
     def parse_event(self, item):
         """Parse a single event item into an Event object."""
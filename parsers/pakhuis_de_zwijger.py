@@ -1,13 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from contextlib import closing
+from datetime import datetime
 from database.models import Event, EventDate
 from parsers.base_parser import BaseParser
-from database.db_manager import DBManager
-from utils.config import DATABASE_URL
-
-import locale
-locale.setlocale(locale.LC_TIME, "nl_NL.UTF-8")
+from utils.dutch_dates import parse_dutch_date
 
 class PakhuisDeZwijgerParser(BaseParser):
     BASE_URL = "https://dezwijger.nl/ajax/agenda/getItems"
@@ -18,49 +13,81 @@ class PakhuisDeZwijgerParser(BaseParser):
     # Set automatic tags for all events from this venue
     automatic_tags = ["Amsterdam"]
 
-    def __init__(self):
-        self.db_manager = DBManager(DATABASE_URL)
-
     def fetch_data(self):
         """Fetch events using AJAX pagination."""
+        return list(self.iter_events())
+
+    def iter_events(self):
+        """Yield new events page by page."""
+        # The first page tells us how many pages there are
+        print("Fetching page 1...")
+        url, params = self._page_request(1)
+        response = self.http.get(url, params=params)
+
+        if response.status_code != 200:
+            print(f"Failed to fetch page 1. Status code: {response.status_code}")
+            return
+
+        data = response.json()
+        total_pages = data.get("total_pages", 1)
+        if not (yield from self._handle_page(response, data)):
+            return
+
+        # Fan out the remaining pages at once, or a few at a time when we expect to stop early
+        pages = self.iter_pages(self._page_request, start=2, stop=total_pages + 1, fan_out=not self.incremental)
+        with closing(pages):
+            for page, response in pages:
+                if response.status_code != 200:
+                    print(f"Failed to fetch page {page}. Status code: {response.status_code}")
+                    break
+
+                print(f"Fetched page {page}...")
+                if not (yield from self._handle_page(response, response.json())):
+                    break
+
+    def _handle_page(self, response, data):
+        """Yield the events of a page to store; returns False when pagination should stop."""
+        if self.is_unchanged(response):
+            print("Page unchanged since last run. Skipping.")
+            return not self.should_stop_paging([response.text], new_events=0)
+
+        events, page_keys, new_events = self._parse_page(data)
+        yield from events
+        return not self.should_stop_paging(page_keys, new_events)
+
+    def _page_request(self, page):
+        """Build the AJAX request for an agenda page."""
         today_str = datetime.today().strftime('%Y/%m/%d')
-        page = 1
-        events = []
-
-        while True:
-            print(f"Fetching page {page}...")
-            response = requests.get(self.BASE_URL, params={"page": page, "prev_date": today_str})
-
-            if response.status_code != 200:
-                print(f"Failed to fetch page {page}. Status code: {response.status_code}")
-                break
+        return self.BASE_URL, {"page": page, "prev_date": today_str}
 
-            data = response.json()
-            total_pages = data.get("total_pages", 1)
-            event_html = data.get("data", "")
+    def _parse_page(self, data):
+        """Parse the events of one AJAX response, skipping known ones.
 
-            soup = BeautifulSoup(event_html, 'html.parser')
-            event_items = soup.find_all('div', class_='program teaser')
-
-            for item in event_items:
-                event = self.parse_event(item)
+        Returns:
+            Tuple of the events to store, keys identifying every event on the
+            page and the number of events that were not known yet
+        """
+        events = []
+        page_keys = []
+        new_events = 0
+        event_html = data.get("data", "")
 
-                if event:
-                    # Get the event date (assuming the first date in the list)
-                    event_date = event.dates[0].date if event.dates else None
+        event_items = self.find_event_items(event_html, 'div', 'program teaser')
 
-                    if self.db_manager.check_event_exists(event.title, event_date):
-                        print(f"Event already exists: {event.title} on {event_date}.")
-                        continue
+        for item in event_items:
+            event = self.parse_event(item)
 
-                    events.append(event)
+            if event:
+                page_keys.append(f"{event.url}|{event.title}")
 
-            if page >= total_pages:
-                break
+                if not self.is_known_event(event):
+                    new_events += 1
+                elif self.skip_known_event(event):
+                    continue
 
-            page += 1
+                events.append(event)
 
-        return events
+        return events, page_keys, new_events
 
     def parse_event(self, item):
         """Parse a single event item from HTML."""
@@ -97,97 +124,9 @@ class PakhuisDeZwijgerParser(BaseParser):
     def parse_date(self, date_text):
         """Parse date and time from raw text, handling Dutch date formats."""
         try:
-            # First, clean up the text
-            date_text = date_text.replace(",", "").strip()
-
-            # Extract parts: "vr 18 apr 09.30" -> day_of_week="vr", day="18", month="apr", time="09.30"
-            parts = date_text.split()
-            if len(parts) >= 3:
-                # Handle format: [day_of_week] [day] [month] [time]
-                # Check if first part is a day of week abbreviation (vr, za, etc.)
-                day_of_week_prefixes = ['ma', 'di', 'wo', 'do', 'vr', 'za', 'zo']
-                start_idx = 1 if parts[0].lower() in day_of_week_prefixes else 0
-
-                # If we have enough parts after skipping day of week
-                if len(parts) >= start_idx + 3:
-                    day = parts[start_idx]
-                    month = parts[start_idx + 1]
-                    time_part = parts[start_idx + 2]
-
-                    # Handle Dutch month abbreviations by mapping to standard ones
-                    dutch_months = {
-                        "jan": "jan", "feb": "feb", "mrt": "mar", "apr": "apr", "mei": "may", "jun": "jun",
-                        "jul": "jul", "aug": "aug", "sep": "sep", "okt": "oct", "nov": "nov", "dec": "dec"
-                    }
-
-                    month_lower = month.lower()
-                    if month_lower in dutch_months:
-                        month = dutch_months[month_lower]
-
-                    # Format the date string for parsing
-                    # Use current year by default
-                    current_year = datetime.now().year
-
-                    # Check if event is likely in the next year
-                    current_month = datetime.now().month
-
-                    # Map month to number directly rather than trying to use strptime
-                    month_num = {
-                        "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-                        "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
-                    }
-                    target_month = month_num.get(month.lower(), 1)
-                    if target_month < current_month and target_month < 4:  # If target month is earlier than current and in first quarter
-                        current_year += 1
-
-                    date_string = f"{day} {month} {current_year}"
-
-                    # Parse date
-                    try:
-                        # Try abbreviated month format first
-                        date_obj = datetime.strptime(date_string, "%d %b %Y")
-                    except ValueError:
-                        # If that fails, try full month format
-                        try:
-                            date_obj = datetime.strptime(date_string, "%d %B %Y")
-                        except ValueError:
-                            # Last resort - manually map month to number and parse
-                            month_num = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-                                         "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
-                            month_int = month_num.get(month.lower(), 1)
-                            date_obj = datetime(current_year, month_int, int(day))
-
-                    # Handle time (convert "09.30" format to proper time)
-                    if "." in time_part:
-                        hour, minute = time_part.split(".")
-                        date_obj = date_obj.replace(hour=int(hour), minute=int(minute))
-
-                    return date_obj
-
-            # Handle special cases like "vandaag" (today) or "morgen" (tomorrow)
-            lower_text = date_text.lower()
-            if "vandaag" in lower_text:
-                today = datetime.today()
-                # Try to extract time if available
-                time_parts = [p for p in parts if "." in p]
-                if time_parts:
-                    hour, minute = time_parts[0].split(".")
-                    today = today.replace(hour=int(hour), minute=int(minute))
-                return today
-
-            if "morgen" in lower_text:
-                tomorrow = datetime.today() + timedelta(days=1)
-                # Try to extract time if available
-                time_parts = [p for p in parts if "." in p]
-                if time_parts:
-                    hour, minute = time_parts[0].split(".")
-                    tomorrow = tomorrow.replace(hour=int(hour), minute=int(minute))
-                return tomorrow
-
-            # No valid date format found, throw an exception
-            raise ValueError(f"Could not parse date format: {date_text}")
-
+            # Formats like "vr 18 apr 09.30", "vandaag 20.00" or "morgen"
+            return parse_dutch_date(date_text)
         except Exception as e:
             # Log and re-throw the exception
             print(f"Failed to parse date: {date_text}. Error: {e}")
-            raise
\ No newline at end of file
+            raise
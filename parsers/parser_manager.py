@@ -1,12 +1,55 @@
+import ast
 import importlib
+import os
 import pkgutil
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from parsers.base_parser import BaseParser
 
+# Metadata of a parser that has been discovered but not imported yet
+ParserSpec = namedtuple('ParserSpec', ['name', 'class_name', 'display_name', 'module_name', 'path'])
+
+
+def discover_parser(module_name, path):
+    """Read a parser's metadata from its source without importing the module."""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+
+        base_names = {base.id if isinstance(base, ast.Name) else getattr(base, 'attr', None) for base in node.bases}
+        if 'BaseParser' not in base_names:
+            continue
+
+        display_name = BaseParser.display_name
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign)
+                    and any(isinstance(target, ast.Name) and target.id == 'display_name' for target in statement.targets)
+                    and isinstance(statement.value, ast.Constant)):
+                display_name = statement.value.value
+
+        return ParserSpec(module_name.rsplit('.', 1)[-1], node.name, display_name, module_name, path)
+
+    return None
+
 
 class ParserManager:
-    def __init__(self, db_session=None):
+    def __init__(self, db_session=None, session_factory=None, full_crawl=False, dedup_index=None,
+                 update_known_events=False):
         self.parsers = {}
+        # Discovered parsers, only imported and instantiated when selected
+        self.registry = {}
         self.db_session = db_session
+        # Used to give each concurrently running parser its own session
+        self.session_factory = session_factory
+        # Disable incremental crawling for every parser that is run
+        self.full_crawl = full_crawl
+        # Known events shared by all parsers, so each one checks duplicates in memory
+        self.dedup_index = dedup_index
+        # Keep known events so the upsert updates them, instead of dropping them in the parsers
+        self.update_known_events = update_known_events
 
     def register_parser(self, name, parser_instance):
         """Register a parser with a unique name."""
@@ -15,39 +58,53 @@ class ParserManager:
         self.parsers[name] = parser_instance
 
     def auto_register_parsers(self, package="parsers"):
-        """Dynamically register all parsers in the package."""
-        for _, module_name, _ in pkgutil.iter_modules([package]):
-            if module_name not in ["base_parser", "parser_manager", "__init__"]:
-                try:
-                    module = importlib.import_module(f"{package}.{module_name}")
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if isinstance(attr, type) and issubclass(attr, BaseParser) and attr is not BaseParser:
-                            self.register_parser(module_name, attr())
-                            print(f"Registered parser: {module_name}")
-                except Exception as e:
-                    print(f"Failed to register parser {module_name}: {e}")
+        """Discover all parsers in the package without importing them."""
+        package_paths = importlib.import_module(package).__path__
+        for module_info in pkgutil.iter_modules(package_paths):
+            module_name = module_info.name
+            if module_info.ispkg or module_name in ["base_parser", "parser_manager", "event_pipeline", "__init__"]:
+                continue
+
+            path = os.path.join(module_info.module_finder.path, f"{module_name}.py")
+            try:
+                spec = discover_parser(f"{package}.{module_name}", path)
+            except (OSError, SyntaxError) as e:
+                print(f"Failed to register parser {module_name}: {e}")
+                continue
+
+            if spec:
+                self.registry[spec.name] = spec
+                print(f"Registered parser: {spec.name}")
+
+    def get_parser_names(self):
+        """Names of all registered parsers, instantiated or not."""
+        return list(dict.fromkeys([*self.registry, *self.parsers]))
 
     def get_parser(self, name):
-        """Retrieve a parser by its name."""
-        return self.parsers.get(name, None)
+        """Retrieve a parser by its name, importing and instantiating it on first use."""
+        if name in self.parsers:
+            return self.parsers[name]
 
-    def run_all_parsers(self):
-        """Run all registered parsers with error handling and return a combined list of events."""
-        all_events = []
-        for name, parser in self.parsers.items():
-            print(f"Running parser: {name}")
-            if self.db_session:
-                events = parser.run_with_error_handling(self.db_session)
-            else:
-                # Fallback if no db_session is provided
-                try:
-                    events = parser.fetch_data()
-                except Exception as e:
-                    print(f"Parser {name} failed with error: {e}")
-                    events = []
-            all_events.extend(events)
-        return all_events
+        spec = self.registry.get(name)
+        if not spec:
+            return None
+
+        try:
+            module = importlib.import_module(spec.module_name)
+            self.register_parser(name, getattr(module, spec.class_name)())
+        except Exception as e:
+            print(f"Failed to load parser {name}: {e}")
+            return None
+        return self.parsers[name]
+
+    def run_all_parsers(self, max_workers=1):
+        """Run all registered parsers with error handling and return a combined list of events.
+
+        With max_workers > 1 the parsers run concurrently in a thread pool. Events
+        are still combined in registration order, so the result does not depend on
+        which venue happens to finish first.
+        """
+        return self.run_parsers(self.get_parser_names(), max_workers=max_workers)
 
     def run_specific_parser(self, name):
         """Run a specific parser with error handling."""
@@ -56,12 +113,121 @@ class ParserManager:
             print(f"Parser '{name}' not found.")
             return []
 
-        if self.db_session:
-            return parser.run_with_error_handling(self.db_session)
+        parser.full_crawl = self.full_crawl
+        parser.dedup_index = self.dedup_index
+        parser.update_known_events = self.update_known_events
+
+        return self._run_parser(name, parser, self.db_session)
+
+    def run_parsers(self, names, max_workers=1):
+        """Run the named parsers, optionally in parallel, and return a combined list of events."""
+        selected = self._select_parsers(names)
+
+        if max_workers <= 1 or len(selected) <= 1 or not self.session_factory:
+            all_events = []
+            for name, parser in selected:
+                print(f"Running parser: {name}")
+                all_events.extend(self._run_parser(name, parser, self.db_session))
+            return all_events
+
+        results = self._run_concurrently(
+            selected, max_workers,
+            lambda name, parser, session: self._run_parser(name, parser, session, apply_tags=False)
+        )
+
+        all_events = []
+        for (name, parser), events in zip(selected, results):
+            all_events.extend(self._tag_events(name, parser, events))
+        return all_events
+
+    def stream_parsers(self, names, pipeline, max_workers=1):
+        """
+        Run the named parsers in streaming mode, feeding their events into the pipeline.
+
+        Returns:
+            Total number of events streamed
+        """
+        selected = self._select_parsers(names)
+
+        if max_workers <= 1 or len(selected) <= 1 or not self.session_factory:
+            total = 0
+            for name, parser in selected:
+                print(f"Streaming parser: {name}")
+                total += parser.stream_with_error_handling(self.db_session, pipeline)
         else:
-            # Fallback if no db_session is provided
-            try:
-                return parser.fetch_data()
-            except Exception as e:
-                print(f"Parser {name} failed with error: {e}")
-                return []
\ No newline at end of file
+            results = self._run_concurrently(
+                selected, max_workers,
+                lambda name, parser, session: parser.stream_with_error_handling(session, pipeline)
+            )
+            total = sum(results)
+
+        # Keep what failed parsers managed to parse before their error
+        try:
+            pipeline.flush()
+        except Exception as e:
+            print(f"Failed to store remaining events: {e}")
+        return total
+
+    def commit_http_caches(self):
+        """Write the cached pages of every parser that ran; call once their events are stored."""
+        for parser in self.parsers.values():
+            parser.commit_http_cache()
+
+    def _select_parsers(self, names):
+        """Resolve parser names to (name, parser) pairs, skipping unknown ones."""
+        selected = []
+        for name in names:
+            parser = self.get_parser(name)
+            if not parser:
+                print(f"Parser '{name}' not found.")
+                continue
+            parser.full_crawl = self.full_crawl
+            parser.dedup_index = self.dedup_index
+            parser.update_known_events = self.update_known_events
+            selected.append((name, parser))
+        return selected
+
+    def _run_concurrently(self, selected, max_workers, run):
+        """Call run(name, parser, session) for each parser in a thread pool, keeping input order."""
+        workers = min(max_workers, len(selected))
+        print(f"Running {len(selected)} parsers with {workers} workers...")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parser") as executor:
+            futures = [executor.submit(self._run_isolated, name, parser, run) for name, parser in selected]
+            return [future.result() for future in futures]
+
+    def _run_parser(self, name, parser, db_session, apply_tags=True):
+        """Run a single parser, logging health when a session is available."""
+        if db_session:
+            return parser.run_with_error_handling(db_session, apply_tags=apply_tags)
+
+        # Fallback if no db_session is provided
+        try:
+            return parser.fetch_data()
+        except Exception as e:
+            print(f"Parser {name} failed with error: {e}")
+            return []
+
+    def _run_isolated(self, name, parser, run):
+        """Run a parser in a worker thread with a session of its own.
+
+        Tagging is left to the manager's session (or the pipeline) so that
+        workers never race each other creating the same tag.
+        """
+        print(f"Running parser: {name}")
+        session = self.session_factory()
+        try:
+            return run(name, parser, session)
+        finally:
+            session.close()
+
+    def _tag_events(self, name, parser, events):
+        """Tag the events of a concurrently run parser in the manager's session."""
+        if not self.db_session:
+            return events
+
+        try:
+            parser.apply_tags(events, self.db_session)
+        except Exception as e:
+            print(f"Failed to tag events of parser {name}: {e}")
+            self.db_session.rollback()
+        return events
@@ -1,14 +1,10 @@
-from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from datetime import datetime
 from database.models import Event, EventDate, Tag
 from parsers.base_parser import BaseParser
-from database.db_manager import DBManager
-from utils.config import DATABASE_URL
-import locale
+from utils.browser_pool import get_browser_pool
+from utils.dutch_dates import parse_dutch_date
 
 class RichelParser(BaseParser):
     BASE_URL = "https://theaterderichel.nl/agenda/"
@@ -19,64 +15,57 @@ class RichelParser(BaseParser):
     # Set automatic tags for all events from this venue
     automatic_tags = ["Amsterdam"]
 
-    def __init__(self):
-        # Set up Selenium WebDriver
-        self.driver = webdriver.Chrome()  # Use the appropriate driver for your browser
-        self.driver.maximize_window()
-        self.db_manager = DBManager(DATABASE_URL)
-
     def fetch_data(self):
         """Fetch all event data by handling scrolling and lazy loading."""
-        self.driver.get(self.BASE_URL)
-        wait = WebDriverWait(self.driver, 10)
-
-        while True:
-            try:
-                # Wait until spinner becomes visible
-                wait.until(
-                    EC.visibility_of_element_located((By.CLASS_NAME, "jet-listing-grid__loader"))
-                )
-
-                # Wait until spinner becomes invisible
-                wait.until(
-                    EC.invisibility_of_element_located((By.CLASS_NAME, "jet-listing-grid__loader"))
-                )
-            except Exception as e:
-                print(f"Error waiting for spinner visibility toggle: {e}")
-                break
-
-            # Scroll to the bottom
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-
-            # Check if spinner reappears, if not, assume no more content
-            try:
-                wait.until(
-                    EC.visibility_of_element_located((By.CLASS_NAME, "jet-listing-grid__loader"))
-                )
-            except Exception as e:
-                print("No more spinner visibility detected. Stopping scrolling.")
-                break
-
-        # Get the final rendered HTML
-        html = self.driver.page_source
-        self.driver.quit()
+        # Borrow a (headless) browser from the shared pool
+        with get_browser_pool().driver() as driver:
+            driver.get(self.BASE_URL)
+            wait = WebDriverWait(driver, 10)
+
+            while True:
+                try:
+                    # Wait until spinner becomes visible
+                    wait.until(
+                        EC.visibility_of_element_located((By.CLASS_NAME, "jet-listing-grid__loader"))
+                    )
+
+                    # Wait until spinner becomes invisible
+                    wait.until(
+                        EC.invisibility_of_element_located((By.CLASS_NAME, "jet-listing-grid__loader"))
+                    )
+                except Exception as e:
+                    print(f"Error waiting for spinner visibility toggle: {e}")
+                    break
+
+                # Scroll to the bottom
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+                # Check if spinner reappears, if not, assume no more content
+                try:
+                    wait.until(
+                        EC.visibility_of_element_located((By.CLASS_NAME, "jet-listing-grid__loader"))
+                    )
+                except Exception as e:
+                    print("No more spinner visibility detected. Stopping scrolling.")
+                    break
+
+            # Get the final rendered HTML
+            html = driver.page_source
 
         # Hand over to BeautifulSoup for parsing
         return self.parse_events(html)
 
     def parse_events(self, html):
         """Parse events from the loaded HTML."""
-        soup = BeautifulSoup(html, "html.parser")
-        event_items = soup.find_all("div", class_="jet-listing-grid__item")  # Adjust class as per the site structure
+        event_items = self.find_event_items(html, "div", "jet-listing-grid__item")  # Adjust class as per the site structure
 
         events = []
         for item in event_items:
             try:
                 event = self.parse_event(item)
                 if event:
-                    # Check if the event already exists
-                    if self.db_manager.check_event_exists(event.title):
-                        print(f"Event already exists: {event.title}.")
+                    # Drop events that already exist, unless they are upserted
+                    if self.skip_known_event(event):
                         continue
 
                     events.append(event)
@@ -167,29 +156,9 @@ class RichelParser(BaseParser):
         Parse Dutch date text into a Python datetime object.
         Supports formats like 'vr 6 jun' and 'vrijdag 6 juni'.
         """
-        # Set locale to Dutch to handle month names
         try:
-            locale.setlocale(locale.LC_TIME, "nl_NL.UTF-8")
-        except locale.Error:
-            print("Locale 'nl_NL.UTF-8' not available. Using default locale.")
-
-        # Define possible date formats
-        date_formats = [
-            "%a %d %b",  # Short format, e.g., "vr 6 jun"
-            "%A %d %b",  # Long format, e.g., "vrijdag 6 jun"
-        ]
-
-        # Current year (assume year is not in the date text)
-        current_year = datetime.now().year
-
-        # Try parsing the date with each format
-        for date_format in date_formats:
-            try:
-                parsed_date = datetime.strptime(date_text, date_format)
-                return parsed_date.replace(year=current_year)  # Add the current year
-            except ValueError:
-                continue
-
-        # If parsing fails
-        print(f"Could not parse date: {date_text}")
-        return None
\ No newline at end of file
+            return parse_dutch_date(date_text)
+        except ValueError:
+            # If parsing fails
+            print(f"Could not parse date: {date_text}")
+            return None
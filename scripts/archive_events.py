@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+# Add the parent directory to the Python path so we can import modules from there
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DBManager
+from utils.config import DATABASE_URL
+from utils.logger import logger
+
+
+def archive_events(interval=None):
+    """Archive past events once, or every interval minutes until interrupted."""
+    db_manager = DBManager(DATABASE_URL)
+    try:
+        while True:
+            db_manager.archive_events()
+            if not interval:
+                break
+            time.sleep(interval * 60)
+    except KeyboardInterrupt:
+        logger.info("Stopped archiving.")
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Archive events whose dates are all in the past.")
+    parser.add_argument('--interval', type=float, help='Keep running and archive every INTERVAL minutes')
+
+    args = parser.parse_args()
+    archive_events(args.interval)
@@ -0,0 +1,113 @@
+import os
+import sys
+from datetime import datetime
+
+# Add the parent directory to the Python path so we can import modules from there
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The event listing is built by the web interface
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web"))
+
+from sqlalchemy import select, text
+from werkzeug.datastructures import MultiDict
+from app import encode_cursor, filter_events, keyset_segments, sort_events
+from database.engine import get_engine, get_session_factory
+from database.models import Event, EventDate, ParserHealth, TagMapping, event_tags
+from utils.config import DATABASE_URL
+
+# (description, statement, index the plan should use)
+QUERIES = [
+    ("Dedup lookup by title",
+     select(Event.id).where(Event.title == "title"), "ix_events_title"),
+    ("Upsert conflict target",
+     select(Event.id).where(Event.fingerprint == "fingerprint"), "ix_events_fingerprint"),
+    ("Dates of an event",
+     select(EventDate.id).where(EventDate.event_id == 1), "ix_event_dates_event_id"),
+    ("Date range filter (start)",
+     select(EventDate.event_id).where(EventDate.date.between(datetime(2025, 1, 1), datetime(2025, 2, 1))),
+     "ix_event_dates_date"),
+    ("Date range filter (end)",
+     select(EventDate.event_id).where(EventDate.end_date.between(datetime(2025, 1, 1), datetime(2025, 2, 1))),
+     "ix_event_dates_end_date"),
+    ("Upcoming events",
+     select(Event.id).where(Event.next_date.between(datetime(2025, 1, 1), datetime(2025, 2, 1))),
+     "ix_events_next_date"),
+    ("Tag filter",
+     select(event_tags.c.event_id).where(event_tags.c.tag_id == 1), "ix_event_tags_tag_id"),
+    ("Health history retention of a parser",
+     select(ParserHealth.id).where(ParserHealth.parser_name == "parser", ParserHealth.last_run < datetime(2025, 1, 1)),
+     "ix_parser_health_parser_name_last_run"),
+    ("Tag mappings of a display tag",
+     select(TagMapping.source_tag).where(TagMapping.display_tag == "tag"), "ix_tag_mappings_display_tag"),
+]
+
+# (description, request arguments, cursor value or None for the first page, index the plan should use)
+LISTING_QUERIES = [
+    ("Events page with the default filters and sort", {}, None, "ix_events_archived_title"),
+    ("Next events page with the default filters and sort", {}, "title", "ix_events_archived_title"),
+    ("Next events page sorted by date", {'sort_by': 'date'}, datetime(2025, 1, 1), "ix_events_archived_first_date"),
+    ("Next events page sorted by next date, descending", {'sort_by': 'next_date', 'sort_dir': 'desc'},
+     datetime(2025, 1, 1), "ix_events_archived_next_date"),
+    ("Next events page including archived events sorted by date", {'sort_by': 'date', 'include_archived': 'true'},
+     datetime(2025, 1, 1), "ix_events_first_date"),
+]
+
+
+def listing_queries(session):
+    """The /api/events page queries, built the way the web interface builds them."""
+    queries = []
+    for description, args, value, index_name in LISTING_QUERIES:
+        args = MultiDict(args)
+        query, rank = filter_events(session, args)
+        query, sort_key = sort_events(query, args, rank)
+        cursor = encode_cursor(sort_key, value, 1) if value is not None else None
+        # The first segment holds the events with a sort value, which is where a page starts
+        queries.append((description, keyset_segments(query, sort_key, cursor)[0].limit(50).statement, index_name))
+    return queries
+
+
+def explain(connection, statement):
+    """Return the query plan of a statement as text."""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return "\n".join(row[-1] for row in rows)
+    rows = connection.execute(text(f"EXPLAIN {sql}")).all()
+    return "\n".join(row[0] for row in rows)
+
+
+def check_query_plans():
+    """Check with EXPLAIN that the main queries use their indexes. Returns True if all do."""
+    engine = get_engine(DATABASE_URL)
+    session = get_session_factory(DATABASE_URL)()
+    try:
+        queries = QUERIES + listing_queries(session)
+    finally:
+        session.close()
+
+    ok = True
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # Small tables are cheaper to scan; only check that the index can be used
+            connection.execute(text("SET enable_seqscan = off"))
+
+        for description, statement, index_name in queries:
+            try:
+                plan = explain(connection, statement)
+            except Exception as e:
+                # E.g. a column that an unmigrated database does not have yet
+                connection.rollback()
+                plan = f"Failed to explain query: {e}"
+            # Sorting the rows instead of reading them in index order defeats the index
+            uses_index = index_name in plan and "TEMP B-TREE FOR ORDER BY" not in plan
+            ok = ok and uses_index
+            print(f"[{'OK' if uses_index else 'MISSING'}] {description}: expected {index_name}")
+            if not uses_index:
+                print("    " + plan.replace("\n", "\n    "))
+
+    if not ok:
+        print("Some queries do not use their index. Run scripts/migrate_database.py.")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_query_plans() else 1)
@@ -4,7 +4,11 @@ import sys
 # Add the parent directory to the Python path so we can import modules from there
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import MetaData
+from database.data_version import bump_data_version
+from database.engine import get_engine
+from database.migrations import migrate, schema_version
+from database.search import drop_search_index
 from database.models import Base
 from utils.config import DATABASE_URL
 from utils.logger import logger
@@ -14,13 +18,13 @@ def empty_database():
     try:
         # Connect to the database
         logger.info(f"Connecting to database: {DATABASE_URL}")
-        engine = create_engine(DATABASE_URL)
+        engine = get_engine(DATABASE_URL)
 
         # Create a metadata instance
         metadata = MetaData()
 
-        # Reflect the existing tables
-        metadata.reflect(bind=engine)
+        # Reflect the existing tables (only the models' tables: the search index follows via triggers)
+        metadata.reflect(bind=engine, only=list(Base.metadata.tables))
 
         # Start a transaction
         connection = engine.connect()
@@ -31,6 +35,8 @@ def empty_database():
         for table_name in reversed(metadata.sorted_tables):
             logger.info(f"Emptying table: {table_name}")
             connection.execute(table_name.delete())
+        # Clients holding the old data must not get a "not modified"
+        bump_data_version(connection)
 
         # Commit the transaction
         trans.commit()
@@ -50,15 +56,22 @@ def drop_and_recreate_database():
     try:
         # Connect to the database
         logger.info(f"Connecting to database: {DATABASE_URL}")
-        engine = create_engine(DATABASE_URL)
+        engine = get_engine(DATABASE_URL)
 
         # Drop all tables
         logger.info("Dropping all tables...")
+        with engine.begin() as connection:
+            drop_search_index(connection)
+            schema_version.drop(connection, checkfirst=True)
         Base.metadata.drop_all(engine)
 
         # Recreate all tables
         logger.info("Recreating all tables...")
         Base.metadata.create_all(engine)
+        migrate(engine)
+        with engine.begin() as connection:
+            # The version survives the reset, so clients holding the old data must not get a "not modified"
+            bump_data_version(connection)
 
         logger.info("Database reset successfully")
 
@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Add the parent directory to the Python path so we can import modules from there
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.engine import get_engine
+from database.migrations import MIGRATIONS, get_schema_version, migrate
+from database.models import Base
+from utils.config import DATABASE_URL
+
+
+def migrate_database():
+    """Create missing tables and apply pending schema migrations."""
+    engine = get_engine(DATABASE_URL)
+    Base.metadata.create_all(engine)
+
+    applied = migrate(engine)
+    with engine.connect() as connection:
+        version = get_schema_version(connection)
+
+    if applied:
+        print(f"Applied migrations {', '.join(map(str, applied))}.")
+    else:
+        print("Database is up to date.")
+    print(f"Schema version {version} of {MIGRATIONS[-1][0]}.")
+
+
+if __name__ == "__main__":
+    migrate_database()
@@ -4,13 +4,14 @@ import sys
 # Add the parent directory to the Python path so we can import modules from there
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import MetaData
+from database.engine import get_engine
 from database.models import Base, ParserHealth
 from utils.config import DATABASE_URL
 
 def reset_parser_health_table():
     # Connect to the database
-    engine = create_engine(DATABASE_URL)
+    engine = get_engine(DATABASE_URL)
 
     # Create a metadata instance
     metadata = MetaData()
@@ -0,0 +1,20 @@
+import logging
+import os
+import sys
+import pytest
+
+# Make the project modules importable, as the scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def keep_test_logs_out_of_parser_log():
+    """Log only to the console, so test runs do not append to parsers/parser.log."""
+    from utils.logger import logger
+
+    file_handlers = [handler for handler in logger.handlers if isinstance(handler, logging.FileHandler)]
+    for handler in file_handlers:
+        logger.removeHandler(handler)
+    yield
+    for handler in file_handlers:
+        logger.addHandler(handler)
@@ -0,0 +1,27 @@
+"""Years of Dutch dates listed without one, relative to a fixed today."""
+from datetime import datetime
+import pytest
+from utils.dutch_dates import parse_dutch_date
+
+TODAY = datetime(2026, 10, 16)  # A Friday
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Weekday matches this year or the next
+    ("vr 16 okt", datetime(2026, 10, 16)),
+    ("zo 3 jan", datetime(2027, 1, 3)),
+    ("wo 18 aug", datetime(2027, 8, 18)),
+    # A weekday matching a year before the rollover keeps the rollover year
+    ("za 3 jan", datetime(2027, 1, 3)),
+    ("do 16 okt", datetime(2026, 10, 16)),
+    # Recent dates stay in this year, older ones move to the next
+    ("1 sep", datetime(2026, 9, 1)),
+    ("1 jul", datetime(2027, 7, 1)),
+])
+def test_year_is_inferred_without_going_back_past_the_rollover(text, expected):
+    assert parse_dutch_date(text, today=TODAY) == expected
+
+
+def test_weekday_can_point_to_last_year_within_the_grace_period():
+    # On New Year's Day, "do 31 dec" is yesterday, not the end of this year
+    assert parse_dutch_date("do 31 dec", today=datetime(2027, 1, 1)) == datetime(2026, 12, 31)
@@ -0,0 +1,51 @@
+"""
+The strained lxml parsing in BaseParser.find_event_items must find the same
+events as building the full tree with html.parser, as the parsers did before.
+"""
+import importlib
+import os
+import pytest
+from bs4 import BeautifulSoup
+
+pytest.importorskip("lxml")
+
+EVENT_DOM_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "parsers", "event_dom")
+
+# (snapshot, parser module, parser class, event card element, event card class)
+SNAPSHOTS = [
+    ("frascati.html", "parsers.frascati", "FrascatiParser", "li", "eventCard"),
+    ("pakhuis_de_zwijger.html", "parsers.pakhuis_de_zwijger", "PakhuisDeZwijgerParser", "div", "program teaser"),
+    ("theatre_richiel.html", "parsers.theatre_richiel", "RichelParser", "div", "jet-listing-grid__item"),
+]
+
+
+def _event_fields(event):
+    return {
+        'title': event.title,
+        'description': event.description,
+        'location': event.location,
+        'url': event.url,
+        'media_url': event.media_url,
+        'dates': [(date.date, date.time, date.end_date, date.end_time) for date in event.dates],
+        'tags': sorted(getattr(event, '_tag_names', None) or []),
+    }
+
+
+def _parse_all(parser, items):
+    return [_event_fields(event) for event in map(parser.parse_event, items) if event]
+
+
+@pytest.mark.parametrize("snapshot, module_name, class_name, name, class_", SNAPSHOTS)
+def test_strained_lxml_matches_full_tree(snapshot, module_name, class_name, name, class_):
+    if module_name == "parsers.theatre_richiel":
+        pytest.importorskip("selenium")
+    parser = getattr(importlib.import_module(module_name), class_name)()
+    with open(os.path.join(EVENT_DOM_DIR, snapshot), encoding="utf-8") as f:
+        markup = f.read()
+
+    full_tree = BeautifulSoup(markup, "html.parser").find_all(name, class_=class_)
+    parser.parser_backend = "lxml"
+    strained = parser.find_event_items(markup, name, class_)
+
+    assert len(strained) == len(full_tree) > 0
+    assert _parse_all(parser, strained) == _parse_all(parser, full_tree)
@@ -0,0 +1,108 @@
+"""
+/api/events loads the dates and tags of all listed events with one query each,
+so the number of statements must not grow with the number of events.
+"""
+import importlib
+import os
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event as sa_event
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+WEB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web")
+
+N = 20
+URLS = [
+    "/api/events",
+    "/api/events?tag=Music",
+    "/api/events?filter=show",
+    "/api/events?sort_by=title&sort_dir=desc",
+    "/api/events?sort_by=date",
+    f"/api/events?limit={N // 2}&include_total=true",
+]
+
+# Listings whose second page (read after the cursor of the first) is counted as well; the
+# pages are small enough that the second one is full and never reaches the end of the listing
+PAGED_URLS = [
+    f"/api/events?limit={N // 4}",
+    f"/api/events?limit={N // 4}&sort_by=date&sort_dir=desc",
+]
+
+
+@pytest.fixture(scope="module")
+def webapp(tmp_path_factory):
+    import utils.config
+
+    db_url = "sqlite:///" + str(tmp_path_factory.mktemp("db") / "events.db")
+    with pytest.MonkeyPatch.context() as patch:
+        # web/app.py connects to DATABASE_URL when it is imported
+        patch.setenv("DATABASE_URL", db_url)
+        patch.setattr(utils.config, "DATABASE_URL", db_url)
+        patch.syspath_prepend(WEB_DIR)
+        module = importlib.import_module("app")
+    assert str(module.engine.url) == db_url
+
+    from database.db_manager import DBManager
+    db_manager = DBManager(db_url)
+    db_manager.create_tables()
+    db_manager.set_tag_mapping("jazz", "Music")
+    module.get_search_backend()
+    yield module, db_manager
+    db_manager.close()
+
+
+def _add_events(db_manager, start, count):
+    from database.models import Event, EventDate
+    from database.tag_cache import TagCache
+
+    tag_ids = TagCache.for_session(db_manager.session).get_ids(["music", "jazz"])
+    now = datetime.now()
+    events = []
+    for i in range(start, start + count):
+        event = Event(title=f"Show {i}", location="Paradiso", url=f"https://example.com/{i}")
+        event.dates = [EventDate(date=now + timedelta(days=i % 7)), EventDate(date=now + timedelta(days=i % 7 + 1))]
+        event._tag_ids = [tag_ids["music"]] + ([tag_ids["jazz"]] if i % 2 else [])
+        events.append(event)
+    db_manager.bulk_add_events(events)
+
+
+def _statement_counts(module):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    client = module.app.test_client()
+    counts = {}
+    sa_event.listen(module.engine, "before_cursor_execute", count)
+    try:
+        next_pages = []
+        for url in PAGED_URLS:
+            cursor = client.get(url).get_json()['next_cursor']
+            assert cursor
+            next_pages.append(f"{url}&cursor={cursor}")
+
+        for url in URLS + PAGED_URLS + next_pages:
+            statements.clear()
+            response = client.get(url)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            # Cursors differ between the runs, the listing they continue does not
+            counts[url.split('&cursor=')[0] + (' (next page)' if '&cursor=' in url else '')] = len(statements)
+    finally:
+        sa_event.remove(module.engine, "before_cursor_execute", count)
+    return counts
+
+
+def test_event_listing_query_count_is_constant(webapp, monkeypatch):
+    module, db_manager = webapp
+    # Every response must be computed, not served from the response cache
+    monkeypatch.setattr(module, "RESPONSE_CACHE_ENABLED", False)
+
+    _add_events(db_manager, 0, N)
+    few = _statement_counts(module)
+    _add_events(db_manager, N, 9 * N)
+    many = _statement_counts(module)
+
+    assert many == few
@@ -0,0 +1,116 @@
+import atexit
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+
+from utils.config import BROWSER_BLOCK_ASSETS, BROWSER_HEADLESS, BROWSER_POOL_SIZE
+from utils.logger import logger
+
+# Resources the parsers never look at
+BLOCKED_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class BrowserPool:
+    """
+    Keeps Chrome WebDrivers alive between parser runs and lends them out.
+
+    At most max_browsers drivers exist at the same time; borrowers block until
+    one is free. A driver that fails while borrowed is discarded instead of being
+    handed out again.
+    """
+
+    def __init__(self, max_browsers=BROWSER_POOL_SIZE, headless=BROWSER_HEADLESS, block_assets=BROWSER_BLOCK_ASSETS):
+        self.headless = headless
+        self.block_assets = block_assets
+        self._slots = threading.BoundedSemaphore(max(1, max_browsers))
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _create_driver(self):
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-extensions")
+        if self.block_assets:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+        driver = webdriver.Chrome(options=options)
+        if self.block_assets:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+            except Exception as e:
+                logger.warning(f"Could not block fonts in browser: {e}")
+        logger.info("Started new browser")
+        return driver
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Failed to quit browser: {e}")
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver for the duration of a with block."""
+        self._slots.acquire()
+        driver = None
+        try:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None or not self._is_alive(driver):
+                driver = self._create_driver()
+
+            try:
+                yield driver
+            except Exception:
+                self._quit(driver)
+                driver = None
+                raise
+
+            # Leave a clean browser for the next borrower
+            try:
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+            except Exception:
+                self._quit(driver)
+                driver = None
+
+            if driver is not None:
+                with self._lock:
+                    self._idle.append(driver)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        """Quit all idle drivers."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+
+def get_browser_pool():
+    """Get the process-wide browser pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
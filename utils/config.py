@@ -6,3 +6,66 @@ load_dotenv()
 
 # Update DATABASE_URL for the new location
 DATABASE_URL = os.getenv("DATABASE_URL")
+
+# SQLite tuning applied to every connection (see database/engine.py)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Connection pool settings for server databases such as PostgreSQL
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# HTTP client settings used by the parsers
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "4"))
+HTTP_USER_AGENT = os.getenv("HTTP_USER_AGENT", "what-where-when/1.0 (+event aggregator)")
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", str(HTTP_POOL_MAXSIZE)))
+HTTP_PREFETCH_WINDOW = int(os.getenv("HTTP_PREFETCH_WINDOW", "4"))
+
+# On-disk cache of listing pages, used for conditional requests
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+# Pages not fetched for this many days are removed from the cache
+HTTP_CACHE_MAX_AGE_DAYS = int(os.getenv("HTTP_CACHE_MAX_AGE_DAYS", "14"))
+
+# Selenium browser pool used by JavaScript-heavy parsers
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+BROWSER_BLOCK_ASSETS = os.getenv("BROWSER_BLOCK_ASSETS", "true").lower() == "true"
+
+# BeautifulSoup tree builder used by the parsers ("lxml" or "html.parser")
+PARSER_BACKEND = os.getenv("PARSER_BACKEND")
+
+# Number of events written per transaction when ingesting
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "100"))
+
+# "upsert" lets the database merge events with the same fingerprint (SQLite and
+# PostgreSQL); "insert" skips duplicates found in the dedup index instead
+INGEST_MODE = os.getenv("INGEST_MODE", "upsert").lower()
+
+# Raw parser health rows older than this are deleted; daily rollups are kept
+PARSER_HEALTH_RETENTION_DAYS = int(os.getenv("PARSER_HEALTH_RETENTION_DAYS", "30"))
+
+# Incremental crawls stop after this many consecutive pages without new events
+INCREMENTAL_STOP_PAGES = int(os.getenv("INCREMENTAL_STOP_PAGES", "2"))
+
+# Event listing pages: largest allowed limit, how long a total count is reused and how many are kept
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+EVENT_COUNT_CACHE_SECONDS = int(os.getenv("EVENT_COUNT_CACHE_SECONDS", "60"))
+EVENT_COUNT_CACHE_MAX_ENTRIES = int(os.getenv("EVENT_COUNT_CACHE_MAX_ENTRIES", "256"))
+
+# Seconds clients may reuse API responses without revalidating (0: revalidate with the ETag every time)
+API_CACHE_MAX_AGE = int(os.getenv("API_CACHE_MAX_AGE", "0"))
+
+# In-process cache of /api/events and /api/tags responses, per data version
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+# Events read from the database per batch when streaming an export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
@@ -0,0 +1,183 @@
+"""
+Locale-independent parsing of the Dutch dates used on venue agenda pages.
+
+Handles optional weekdays and years, abbreviated and full day/month names,
+"vandaag"/"morgen", times such as "09.30" and ranges joined by "-" or "en".
+Nothing here touches the process-wide locale, so parsers can call it from
+concurrent worker threads.
+"""
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+MONTHS = {
+    "jan": 1, "januari": 1,
+    "feb": 2, "febr": 2, "februari": 2,
+    "mrt": 3, "maa": 3, "maart": 3,
+    "apr": 4, "april": 4,
+    "mei": 5,
+    "jun": 6, "juni": 6,
+    "jul": 7, "juli": 7,
+    "aug": 8, "augustus": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "okt": 10, "oktober": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+
+WEEKDAYS = {
+    "ma": 0, "maandag": 0,
+    "di": 1, "dinsdag": 1,
+    "wo": 2, "woensdag": 2,
+    "do": 3, "donderdag": 3,
+    "vr": 4, "vrijdag": 4,
+    "za": 5, "zaterdag": 5,
+    "zo": 6, "zondag": 6,
+}
+
+RELATIVE_DAYS = {"vandaag": 0, "morgen": 1, "overmorgen": 2}
+
+# Dates without a year that lie further in the past than this belong to next year
+ROLLOVER_GRACE = timedelta(days=90)
+
+_TIME = r"(?:,?\s+(?:om\s+)?(?P<hour>\d{1,2})[.:](?P<minute>\d{2})(?:\s*uur)?)?"
+
+_DATE_RE = re.compile(
+    r"^(?:(?P<weekday>[a-z]+)\.?\s+)?"
+    r"(?P<day>\d{1,2})\.?\s+(?P<month>[a-z]+)\.?"
+    r"(?:\s+'?(?P<year>\d{4}|\d{2}))?"
+    + _TIME + r"$"
+)
+
+_RELATIVE_RE = re.compile(r"^(?P<relative>[a-z]+)" + _TIME + r"$")
+
+_RANGE_RE = re.compile(r"^(?P<start>.+?)\s+(?P<separator>-|–|t/m|tot|en)\s+(?P<end>.+)$")
+
+_DAY_ONLY_RE = re.compile(r"^(?:[a-z]+\.?\s+)?\d{1,2}\.?$")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize(text):
+    """Lowercase, unify apostrophes and collapse whitespace."""
+    text = text.replace("’", "'").replace("‘", "'").replace(",", " ")
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def parse_dutch_date(text, today=None):
+    """
+    Parse a Dutch date such as "vr 18 apr 09.30", "vrijdag 6 juni" or "di 11 mrt '25".
+
+    Args:
+        text: Date text as shown on the website
+        today: Reference date for "vandaag"/"morgen" and for dates without a year
+
+    Returns:
+        datetime, including the time when one was given
+
+    Raises:
+        ValueError: If the text is not a recognised date
+    """
+    if not text:
+        raise ValueError("Empty date string")
+    today = today or datetime.today()
+    return _parse_normalized(normalize(text), today.date())
+
+
+def parse_dutch_date_range(text, today=None):
+    """
+    Parse a date or a combination of two dates.
+
+    "11 mrt - 15 mrt" is one interval, "11 mrt en 15 mrt" two separate dates.
+    The start of a range may omit the month ("11 - 15 mrt").
+
+    Returns:
+        List of (start, end) tuples; end is None for single dates
+    """
+    if not text:
+        raise ValueError("Empty date string")
+    today = today or datetime.today()
+    return list(_parse_range_normalized(normalize(text), today.date()))
+
+
+@lru_cache(maxsize=4096)
+def _parse_range_normalized(text, today):
+    match = _RANGE_RE.match(text)
+    if not match:
+        return ((_parse_normalized(text, today), None),)
+
+    start_text, separator, end_text = match.group("start", "separator", "end")
+    end = _parse_normalized(end_text, today)
+    if _DAY_ONLY_RE.match(start_text):
+        # "11 - 15 mrt": take month and year from the end date
+        day = int(start_text.split()[-1].rstrip("."))
+        start = end.replace(day=day, hour=0, minute=0)
+    else:
+        start = _parse_normalized(start_text, today)
+
+    # A range like "28 dec - 3 jan" without years crosses into the next year
+    if end < start and end.year == start.year:
+        end = end.replace(year=end.year + 1)
+
+    if separator == "en":
+        return (start, None), (end, None)
+    return ((start, end),)
+
+
+@lru_cache(maxsize=4096)
+def _parse_normalized(text, today):
+    match = _DATE_RE.match(text)
+    if match:
+        weekday, month_name = match.group("weekday", "month")
+        if weekday is not None and weekday not in WEEKDAYS:
+            raise ValueError(f"Could not parse date: '{text}' (unknown weekday '{weekday}')")
+        month = MONTHS.get(month_name)
+        if month is None:
+            raise ValueError(f"Could not parse date: '{text}' (unknown month '{month_name}')")
+
+        day = int(match.group("day"))
+        year = match.group("year")
+        if year:
+            year = int(year)
+            date = datetime(year + 2000 if year < 100 else year, month, day)
+        else:
+            date = _infer_year(today, month, day, WEEKDAYS.get(weekday))
+        return _with_time(date, match)
+
+    match = _RELATIVE_RE.match(text)
+    if match and match.group("relative") in RELATIVE_DAYS:
+        date = datetime(today.year, today.month, today.day) + timedelta(days=RELATIVE_DAYS[match.group("relative")])
+        return _with_time(date, match)
+
+    raise ValueError(f"Could not parse date: '{text}'")
+
+
+def _infer_year(today, month, day, weekday=None):
+    """Pick the year for a date given without one."""
+    if month == 2 and day == 29:
+        # Leap day: the first leap year from now on
+        year = next(y for y in range(today.year, today.year + 4) if y % 4 == 0 and (y % 100 != 0 or y % 400 == 0))
+        return datetime(year, month, day)
+
+    date = datetime(today.year, month, day)
+    if date.date() < today - ROLLOVER_GRACE:
+        date = date.replace(year=today.year + 1)
+
+    # A weekday that does not match means the listing refers to a neighbouring year,
+    # but never one that would put the date back past the rollover
+    if weekday is not None and date.weekday() != weekday:
+        for year in (date.year + 1, date.year - 1):
+            try:
+                candidate = date.replace(year=year)
+            except ValueError:
+                continue
+            if candidate.weekday() == weekday and candidate.date() >= today - ROLLOVER_GRACE:
+                return candidate
+    return date
+
+
+def _with_time(date, match):
+    hour = match.group("hour")
+    if hour is None:
+        return date
+    return date.replace(hour=int(hour), minute=int(match.group("minute")))
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils.config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_AGE_DAYS
+
+
+class HttpCache:
+    """
+    On-disk store of validators (ETag/Last-Modified), content hashes and bodies per URL.
+
+    New entries are kept pending until flush() so that a failed parser run does
+    not mark pages as seen whose events never made it into the database. The
+    caller flushes only once those events are stored.
+
+    Entries that were not fetched for max_age_days are pruned on flush, so pages
+    whose URL changes over time (e.g. a date parameter) do not pile up.
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_age_days=HTTP_CACHE_MAX_AGE_DAYS):
+        self.directory = directory
+        self.max_age_days = max_age_days
+        self._pending = {}
+        self._touched = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(url):
+        """Cache key for a fully prepared URL."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def hash_content(content):
+        """Content hash used to detect unchanged pages on servers without validators."""
+        return hashlib.sha256(content).hexdigest()
+
+    def load(self, url):
+        """Return the cached entry for a URL as (metadata, body), or None."""
+        key = self.key_for(url)
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+
+        path = os.path.join(self.directory, key)
+        try:
+            with open(f"{path}.json", "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            with open(f"{path}.body", "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return metadata, body
+
+    def store(self, url, response, content_hash):
+        """Remember a fetched page until the next flush()."""
+        metadata = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": content_hash,
+            "encoding": response.encoding,
+        }
+        with self._lock:
+            self._pending[self.key_for(url)] = (metadata, response.content)
+
+    def touch(self, url):
+        """Mark a cached page as fetched again (e.g. after a 304), so it is not pruned."""
+        with self._lock:
+            self._touched.add(self.key_for(url))
+
+    def flush(self):
+        """Write pending entries to disk and prune entries that were not fetched for a while."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched - set(pending), set()
+
+        if pending:
+            os.makedirs(self.directory, exist_ok=True)
+        for key, (metadata, body) in pending.items():
+            path = os.path.join(self.directory, key)
+            self._write_atomic(f"{path}.body", body)
+            self._write_atomic(f"{path}.json", json.dumps(metadata).encode("utf-8"))
+        for key in touched:
+            path = os.path.join(self.directory, key)
+            for suffix in (".json", ".body"):
+                try:
+                    os.utime(f"{path}{suffix}")
+                except OSError:
+                    pass
+
+        self.prune()
+
+    def prune(self, max_age_days=None):
+        """Remove entries whose page was not fetched in max_age_days. Returns the number removed."""
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        if not max_age_days:
+            return 0
+
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name[:-len(".json")])
+            try:
+                if os.path.getmtime(f"{path}.json") >= cutoff:
+                    continue
+                for suffix in (".json", ".body"):
+                    if os.path.exists(f"{path}{suffix}"):
+                        os.remove(f"{path}{suffix}")
+                removed += 1
+            except OSError:
+                # Removed concurrently by another parser's cache
+                continue
+        return removed
+
+    def discard(self):
+        """Forget pending entries, e.g. after a failed run."""
+        with self._lock:
+            self._pending = {}
+            self._touched = set()
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,158 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.config import (
+    HTTP_BACKOFF_FACTOR,
+    HTTP_CACHE_ENABLED,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_MAXSIZE,
+    HTTP_TIMEOUT,
+    HTTP_USER_AGENT,
+)
+from utils.http_cache import HttpCache
+
+# Transient statuses worth retrying with backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def build_session(max_retries=HTTP_MAX_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR,
+                  pool_maxsize=HTTP_POOL_MAXSIZE):
+    """Create a requests session with keep-alive pooling and retry/backoff configured."""
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Hand the last response back so parsers can inspect the status
+    )
+    # pool_maxsize caps the connections kept per host, pool_block makes it a hard limit
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=pool_maxsize, pool_block=True)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": HTTP_USER_AGENT})
+    return session
+
+
+def get_shared_session():
+    """Get the process-wide pooled session, creating it on first use."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = build_session()
+        return _shared_session
+
+
+class HttpClient:
+    """Fetch layer for parsers on top of a pooled session, with per-client counters.
+
+    When a cache is configured, responses carry an ``unchanged`` attribute that is
+    True if the server answered 304 or returned a body identical to the cached one.
+    """
+
+    def __init__(self, session=None, timeout=HTTP_TIMEOUT, cache=None):
+        self.session = session or get_shared_session()
+        self.timeout = timeout
+        self.cache = cache if cache is not None else (HttpCache() if HTTP_CACHE_ENABLED else None)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.bytes_received = 0
+        self.total_latency = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def get(self, url, params=None, use_cache=True, **kwargs):
+        """Perform a GET request, retrying transient failures with exponential backoff."""
+        kwargs.setdefault("timeout", self.timeout)
+        cache = self.cache if use_cache else None
+        cached = None
+        if cache:
+            # Key on the final URL so that query parameters are part of it
+            url = requests.Request("GET", url, params=params).prepare().url
+            params = None
+            cached = cache.load(url)
+            if cached:
+                kwargs["headers"] = {**kwargs.get("headers", {}), **self._conditional_headers(cached[0])}
+
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, **kwargs)
+        except requests.RequestException:
+            self._record(time.perf_counter() - started, 0, failed=True)
+            raise
+
+        self._record(time.perf_counter() - started, len(response.content), failed=response.status_code >= 400)
+
+        response.unchanged = False
+        if cache:
+            self._apply_cache(cache, url, response, cached)
+        return response
+
+    @staticmethod
+    def _conditional_headers(metadata):
+        headers = {}
+        if metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+        return headers
+
+    def _apply_cache(self, cache, url, response, cached):
+        """Serve 304s from the cache and flag responses whose content did not change."""
+        if response.status_code == 304 and cached:
+            metadata, body = cached
+            response.status_code = 200
+            response._content = body
+            response.encoding = metadata.get("encoding")
+            response.unchanged = True
+            cache.touch(url)
+        elif response.status_code == 200:
+            content_hash = cache.hash_content(response.content)
+            response.unchanged = bool(cached) and cached[0].get("content_hash") == content_hash
+            cache.store(url, response, content_hash)
+        else:
+            return
+
+        with self._lock:
+            if response.unchanged:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def _record(self, latency, size, failed=False):
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            self.bytes_received += size
+            if failed:
+                self.failures += 1
+
+    def reset_stats(self):
+        """Zero the counters, e.g. at the end of a parser run."""
+        with self._lock:
+            self.requests = self.failures = self.bytes_received = 0
+            self.cache_hits = self.cache_misses = 0
+            self.total_latency = 0.0
+
+    @property
+    def stats(self):
+        """Snapshot of the request counters."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "bytes_received": self.bytes_received,
+                "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0.0,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+            }
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit
+
+from utils.config import HTTP_MAX_PER_HOST, HTTP_PREFETCH_WINDOW
+
+# In-flight requests per host, shared by all fetchers so concurrent parsers are limited together
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+
+def host_slots(host, limit=HTTP_MAX_PER_HOST):
+    """Process-wide semaphore for a host; the first fetcher to reach the host sets its limit."""
+    with _host_slots_lock:
+        slots = _host_slots.get(host)
+        if slots is None:
+            slots = _host_slots[host] = threading.BoundedSemaphore(max(1, limit))
+        return slots
+
+
+class PageFetcher:
+    """
+    Pipelined page fetching on an asyncio event loop.
+
+    Requests go through the parser's HttpClient in a small thread pool while a
+    per-host semaphore keeps the number of in-flight requests to one site bounded.
+    The semaphores are shared by all fetchers in the process, so the limit also
+    holds across calls and across parsers running concurrently.
+    Pages are always yielded in page order, so callers can keep their sequential
+    parsing logic and simply stop iterating at the last page.
+    """
+
+    def __init__(self, client, max_per_host=HTTP_MAX_PER_HOST, window=HTTP_PREFETCH_WINDOW):
+        self.client = client
+        self.max_per_host = max(1, max_per_host)
+        self.window = max(1, window)
+
+    def iter_pages(self, build_request, start=1, stop=None, fan_out=True):
+        """
+        Yield (page, response) tuples for consecutive pages.
+
+        Args:
+            build_request: Callable mapping a page number to a (url, params) tuple
+            start: First page to fetch
+            stop: Page number to stop before, when the total is known. All pages
+                are then fanned out at once; otherwise a window of pages ahead of
+                the consumer is prefetched speculatively until iteration stops.
+            fan_out: Set to False to prefetch only a window ahead even when stop
+                is known, for callers that expect to stop early.
+        """
+        window = (stop - start) if stop is not None and fan_out else self.window
+        if stop is not None:
+            window = min(window, stop - start)
+        if window <= 0:
+            return
+
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=min(self.max_per_host, window), thread_name_prefix="fetch")
+        pending = {}
+
+        def get(url, params):
+            with host_slots(urlsplit(url).netloc, self.max_per_host):
+                return self.client.get(url, params=params)
+
+        async def fetch(page):
+            url, params = build_request(page)
+            return await loop.run_in_executor(executor, partial(get, url, params))
+
+        page = start
+        next_page = start
+        try:
+            while stop is None or page < stop:
+                # Keep the window full ahead of the page being consumed
+                while len(pending) < window and (stop is None or next_page < stop):
+                    pending[next_page] = loop.create_task(fetch(next_page))
+                    next_page += 1
+
+                response = loop.run_until_complete(pending.pop(page))
+                yield page, response
+                page += 1
+        finally:
+            # Drop speculative pages the consumer no longer needs
+            for task in pending.values():
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending.values(), return_exceptions=True))
+            executor.shutdown(wait=True, cancel_futures=True)
+            loop.close()
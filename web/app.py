@@ -1,21 +1,37 @@
+import base64
+import csv
+import io
+import json
 import os
 import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
 from datetime import datetime
+from functools import wraps
 
 # Add the parent directory to the Python path so we can import modules from there
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, g, jsonify, make_response, request, render_template
 from flask_cors import CORS
-from sqlalchemy import create_engine, desc, or_, and_
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import DateTime, or_, and_, tuple_
+from sqlalchemy.orm import selectinload
 from dotenv import load_dotenv
-from calendar_service import create_calendar_event, setup_credentials
+from response_cache import ResponseCache
 
-from database.models import Event, EventDate, ParserHealth
-from database.models import Tag, event_tags
+from database.models import Event, EventDate, ParserStatus
+from database.models import Tag, TagMapping
+from database.data_version import get_data_version
 from database.db_manager import DBManager
-from utils.config import DATABASE_URL
+from database.engine import get_engine, get_session_factory
+from database.parser_health import daily_summaries
+from database.search import apply_search, search_backend
+from utils.config import (API_CACHE_MAX_AGE, API_MAX_PAGE_SIZE, DATABASE_URL, EVENT_COUNT_CACHE_MAX_ENTRIES,
+                          EVENT_COUNT_CACHE_SECONDS, EXPORT_BATCH_SIZE, RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_MAX_BYTES,
+                          RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL)
+from utils.logger import logger
 
 # Load environment variables
 load_dotenv()
@@ -25,8 +41,113 @@ app = Flask(__name__, static_folder='static')
 CORS(app)  # Enable CORS for all routes
 
 # Database connection
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
+engine = get_engine(DATABASE_URL)
+Session = get_session_factory(DATABASE_URL)
+
+# Serialized responses of the hot read endpoints, shared by all clients
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL)
+
+# Columns the event list can be sorted by; "date" is the first date, as shown in the table
+SORT_COLUMNS = {
+    'title': Event.title,
+    'location': Event.location,
+    'archived': Event.archived,
+    'date': Event.first_date,
+    'next_date': Event.next_date,
+    'last_date': Event.last_date,
+}
+
+# Formats of /api/events/export and their content types
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Request arguments that select events (as opposed to sorting or paging them)
+FILTER_ARGS = ('filter', 'include_archived', 'date_start', 'date_end', 'tag')
+
+_search_backend = None
+
+
+def get_search_backend():
+    """
+    Full-text backend of the database, looked up once per process when there is one.
+
+    Until the index is installed (e.g. before the migrations ran) it is looked
+    up again for every search, so the web interface starts using it without a restart.
+    """
+    global _search_backend
+    if _search_backend is None:
+        with engine.connect() as connection:
+            _search_backend = search_backend(connection)
+    return _search_backend
+
+
+def _set_cache_headers(response, version):
+    response.set_etag(str(version))
+    if API_CACHE_MAX_AGE:
+        response.cache_control.max_age = API_CACHE_MAX_AGE
+    else:
+        # Clients may keep the response but must revalidate it every time
+        response.cache_control.no_cache = True
+    return response
+
+
+def versioned(view):
+    """
+    Make a read endpoint conditional on the data version.
+
+    The response carries the data version as its ETag; a request whose
+    If-None-Match holds the current version gets a 304 after reading only the
+    data_version row.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            with engine.connect() as connection:
+                version = get_data_version(connection)
+        except Exception as e:
+            logger.warning(f"Could not read the data version: {e}")
+            version = None
+        if not version:
+            return view(*args, **kwargs)
+
+        g.data_version = version
+        if request.if_none_match.contains(str(version)):
+            return _set_cache_headers(make_response('', 304), version)
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            _set_cache_headers(response, version)
+        return response
+
+    return wrapper
+
+
+def cached(view):
+    """
+    Serve a read endpoint from the response cache while the data version is unchanged.
+
+    Requests with the same arguments share one entry. Must be applied inside
+    @versioned, which reads the data version.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = g.get('data_version')
+        if not RESPONSE_CACHE_ENABLED or not version:
+            return view(*args, **kwargs)
+
+        key = ResponseCache.make_key(request.path, request.args)
+        body = response_cache.get(key, version)
+        if body is not None:
+            return app.response_class(body, mimetype='application/json')
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response_cache.put(key, version, response.get_data())
+        return response
+
+    return wrapper
 
 
 # Routes
@@ -36,134 +157,353 @@ def index():
     return render_template('index.html')
 
 
+def filter_events(session, args):
+    """
+    Build the filtered event query for the listing's request arguments.
+
+    Tag and date filters are EXISTS subqueries, so every event appears once
+    without DISTINCT.
+
+    Returns:
+        (query, rank) where rank is the search relevance column (lower is
+        better) or None
+    """
+    filter_text = args.get('filter', '')
+    include_archived = args.get('include_archived', 'false').lower() == 'true'
+    date_start = args.get('date_start')
+    date_end = args.get('date_end')
+    tag_filter = args.get('tag')
+
+    query = session.query(Event)
+
+    # Apply tag filter if provided; a display tag matches all source tags mapped to it
+    if tag_filter:
+        tag_names = [source_tag for (source_tag,) in
+                     session.query(TagMapping.source_tag).filter(TagMapping.display_tag == tag_filter)]
+        tag_names.append(tag_filter)
+        query = query.filter(Event.tags.any(Tag.name.in_(tag_names)))
+
+    # Apply other filters
+    rank = None
+    if filter_text:
+        query, rank = apply_search(query, get_search_backend(), filter_text)
+
+    if not include_archived:
+        query = query.filter(Event.archived == False)
+
+    # Apply date range filter if provided
+    if date_start and date_end:
+        try:
+            start_date = datetime.strptime(date_start, '%Y-%m-%d')
+            end_date = datetime.strptime(date_end, '%Y-%m-%d')
+
+            # Narrow down on the indexed event columns before checking the individual dates
+            query = query.filter(Event.first_date <= end_date, Event.last_date >= start_date)
+            query = query.filter(Event.dates.any(
+                or_(
+                    and_(EventDate.date >= start_date, EventDate.date <= end_date),
+                    and_(EventDate.end_date >= start_date, EventDate.end_date <= end_date),
+                    and_(EventDate.date <= start_date, EventDate.end_date >= end_date)
+                )
+            ))
+        except (ValueError, TypeError):
+            # If date parsing fails, ignore the date filter
+            pass
+
+    return query, rank
+
+
+def sort_events(query, args, rank=None):
+    """
+    Sort a filtered event query; events without a value go last, ties by id.
+
+    Returns:
+        (query, sort_key) where the query yields (event, sort value) rows and
+        sort_key identifies the ordering for cursors
+
+    Raises:
+        ValueError: if the sort column is not supported
+    """
+    sort_by = args.get('sort_by', 'title')
+    descending = args.get('sort_dir', 'asc') == 'desc'
+    if sort_by not in SORT_COLUMNS and sort_by != 'relevance':
+        raise ValueError(f"Cannot sort by '{sort_by}'")
+
+    if sort_by == 'relevance' and rank is not None:
+        # Best matches first
+        sort_column, descending = rank, False
+    else:
+        # Without search text there is nothing to rank, so relevance falls back to the title
+        sort_by = sort_by if sort_by in SORT_COLUMNS else 'title'
+        sort_column = SORT_COLUMNS[sort_by]
+
+    if descending:
+        query = query.order_by(sort_column.desc().nulls_last(), Event.id.desc())
+    else:
+        query = query.order_by(sort_column.asc().nulls_last(), Event.id)
+    return query.add_columns(sort_column), (sort_by, descending, sort_column)
+
+
+def encode_cursor(sort_key, value, event_id):
+    """Opaque cursor pointing just after the given row of a sorted listing."""
+    sort_by, descending, _ = sort_key
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, descending, value, event_id])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def keyset_segments(query, sort_key, cursor=None):
+    """
+    Continue a sorted listing after a cursor (keyset pagination).
+
+    Returns the rest of the listing as queries to read in order: the events
+    with a sort value after the cursor, then those without one (they sort
+    last). Each is a range on (sort value, id), which the sort indexes answer
+    directly, so a deep page costs the same as the first page.
+
+    Raises:
+        ValueError: if the cursor is malformed or was made for another sort
+    """
+    sort_by, descending, sort_column = sort_key
+    if cursor is None:
+        with_value = query.filter(sort_column.isnot(None))
+    else:
+        try:
+            cursor_sort, cursor_descending, value, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            if value is not None and isinstance(getattr(sort_column, 'type', None), DateTime):
+                value = datetime.fromisoformat(value)
+            event_id = int(event_id)
+        except (ValueError, TypeError, UnicodeError):
+            raise ValueError("Invalid cursor")
+        if (cursor_sort, cursor_descending) != (sort_by, descending):
+            raise ValueError("Cursor does not match the requested sort")
+
+        if value is None:
+            # Already among the events without a value
+            after_id = Event.id < event_id if descending else Event.id > event_id
+            return [query.filter(sort_column.is_(None), after_id)]
+        if descending:
+            with_value = query.filter(tuple_(sort_column, Event.id) < tuple_(value, event_id))
+        else:
+            with_value = query.filter(tuple_(sort_column, Event.id) > tuple_(value, event_id))
+
+    return [with_value, query.filter(sort_column.is_(None))]
+
+
+_count_cache = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def count_events(query, args):
+    """
+    Number of events matching the filters, reused for EVENT_COUNT_CACHE_SECONDS or until the data changes.
+
+    At most EVENT_COUNT_CACHE_MAX_ENTRIES counts are kept, least recently used
+    first out; counts of older data versions are dropped as soon as a newer
+    one is stored.
+    """
+    version = g.get('data_version')
+    key = (version,) + tuple(sorted((name, args.get(name, '')) for name in FILTER_ARGS))
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached and cached[0] > now:
+            _count_cache.move_to_end(key)
+            return cached[1]
+
+    total = query.order_by(None).count()
+    with _count_cache_lock:
+        for stale in [cached_key for cached_key in _count_cache if cached_key[0] != version]:
+            del _count_cache[stale]
+        _count_cache[key] = (now + EVENT_COUNT_CACHE_SECONDS, total)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > EVENT_COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.popitem(last=False)
+    return total
+
+
+def event_to_dict(event, display_tags):
+    """Serialize an event with its dates and tags; display_tags maps source tags to display tags."""
+    return {
+        'id': event.id,
+        'title': event.title,
+        'description': event.description,
+        'location': event.location,
+        'url': event.url,
+        'media_url': event.media_url,
+        'archived': event.archived,
+        'first_date': event.first_date.isoformat() if event.first_date else None,
+        'next_date': event.next_date.isoformat() if event.next_date else None,
+        'last_date': event.last_date.isoformat() if event.last_date else None,
+        'dates': [{
+            'id': date.id,
+            'date': date.date.isoformat() if date.date else None,
+            'time': date.time,
+            'end_date': date.end_date.isoformat() if date.end_date else None,
+            'end_time': date.end_time
+        } for date in event.dates],
+        'tags': [{
+            'id': tag.id,
+            'name': tag.name,
+            'display_name': display_tags.get(tag.name, tag.name)
+        } for tag in event.tags]
+    }
+
+
+def get_display_tags(session):
+    """All tag mappings as a dict of source tag to display tag, in one query."""
+    return dict(session.query(TagMapping.source_tag, TagMapping.display_tag).all())
+
+
 @app.route('/api/events')
+@versioned
+@cached
 def get_events():
     """Get all events with optional filtering."""
     session = Session()
-    db_manager = DBManager(DATABASE_URL)
 
     try:
-        # Get query parameters
-        filter_text = request.args.get('filter', '')
-        sort_by = request.args.get('sort_by', 'title')
-        sort_dir = request.args.get('sort_dir', 'asc')
-        include_archived = request.args.get('include_archived', 'false').lower() == 'true'
-        date_start = request.args.get('date_start')
-        date_end = request.args.get('date_end')
-        tag_filter = request.args.get('tag')  # Get tag filter parameter
-
-        # Base query with joins
-        query = session.query(Event).outerjoin(Event.dates)
-
-        # Apply tag filter if provided
-        if tag_filter:
-            # First check if this is a display tag with mappings
-            mapped_source_tags = []
-            tag_mappings = db_manager.get_tag_mappings()
-
-            for mapping in tag_mappings:
-                if mapping.display_tag == tag_filter:
-                    mapped_source_tags.append(mapping.source_tag)
-
-            if mapped_source_tags:
-                # Filter by any of the source tags that map to the requested display tag
-                tag_filter_conditions = [Tag.name == source_tag for source_tag in mapped_source_tags]
-                tag_filter_conditions.append(Tag.name == tag_filter)  # Also include the display tag itself
-                query = query.join(event_tags, Event.id == event_tags.c.event_id) \
-                    .join(Tag, Tag.id == event_tags.c.tag_id) \
-                    .filter(or_(*tag_filter_conditions))
-            else:
-                # Filter by exact tag name (for unmapped tags)
-                query = query.join(event_tags, Event.id == event_tags.c.event_id) \
-                    .join(Tag, Tag.id == event_tags.c.tag_id) \
-                    .filter(Tag.name == tag_filter)
-
-        # Apply other filters
-        if filter_text:
-            query = query.filter(
-                or_(
-                    Event.title.ilike(f'%{filter_text}%'),
-                    Event.description.ilike(f'%{filter_text}%'),
-                    Event.location.ilike(f'%{filter_text}%')
-                )
-            )
+        limit = request.args.get('limit') or None
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                return jsonify({'error': 'limit must be a whole number'}), 400
+            if limit < 1:
+                return jsonify({'error': 'limit must be at least 1'}), 400
+
+        filtered, rank = filter_events(session, request.args)
+        try:
+            query, sort_key = sort_events(filtered, request.args, rank)
+            # One query for the events, one each for all their dates and tags
+            query = query.options(selectinload(Event.dates), selectinload(Event.tags))
+            segments = keyset_segments(query, sort_key, cursor) if limit is not None or cursor else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if segments is None:
+            # Without a limit the whole listing is returned as a plain array
+            rows = query.all()
+            display_tags = get_display_tags(session)
+            return jsonify([event_to_dict(event, display_tags) for event, _ in rows])
+
+        # A cursor without a limit continues with full pages
+        limit = API_MAX_PAGE_SIZE if limit is None else min(limit, API_MAX_PAGE_SIZE)
+        rows = []
+        for segment in segments:
+            # One row more than the page tells whether there is a next page
+            rows += segment.limit(limit + 1 - len(rows)).all()
+            if len(rows) > limit:
+                break
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_event, last_value = rows[-1]
+            next_cursor = encode_cursor(sort_key, last_value, last_event.id)
+
+        display_tags = get_display_tags(session)
+        page = {
+            'events': [event_to_dict(event, display_tags) for event, _ in rows],
+            'next_cursor': next_cursor,
+        }
+        if include_total:
+            page['total'] = count_events(filtered, request.args)
+        return jsonify(page)
 
-        if not include_archived:
-            query = query.filter(Event.archived == False)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        # Apply date range filter if provided
-        if date_start and date_end:
-            try:
-                start_date = datetime.strptime(date_start, '%Y-%m-%d')
-                end_date = datetime.strptime(date_end, '%Y-%m-%d')
-
-                query = query.filter(
-                    or_(
-                        and_(EventDate.date >= start_date, EventDate.date <= end_date),
-                        and_(EventDate.end_date >= start_date, EventDate.end_date <= end_date),
-                        and_(EventDate.date <= start_date, EventDate.end_date >= end_date)
-                    )
-                )
-            except (ValueError, TypeError):
-                # If date parsing fails, ignore the date filter
-                pass
-
-        # Apply sorting (except for date which is handled client-side)
-        if sort_by != 'date':
-            if sort_dir == 'desc':
-                query = query.order_by(desc(getattr(Event, sort_by)))
+    finally:
+        session.close()
+
+
+# Columns of the CSV export; dates and tags are joined into one cell each
+EXPORT_CSV_COLUMNS = ['id', 'title', 'description', 'location', 'url', 'media_url', 'archived',
+                      'first_date', 'next_date', 'last_date', 'dates', 'tags']
+
+
+def _csv_row(event_dict):
+    row = dict(event_dict)
+    row['dates'] = '; '.join(
+        date['date'] + (f"/{date['end_date']}" if date['end_date'] else '')
+        for date in event_dict['dates'] if date['date'])
+    row['tags'] = '; '.join(tag['display_name'] for tag in event_dict['tags'])
+    return [row[column] for column in EXPORT_CSV_COLUMNS]
+
+
+def _export_lines(session, query, export_format):
+    """Serialize events one by one, reading them from the database in batches."""
+    try:
+        display_tags = get_display_tags(session)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == 'csv':
+            writer.writerow(EXPORT_CSV_COLUMNS)
+
+        for count, (event, _) in enumerate(query.yield_per(EXPORT_BATCH_SIZE), 1):
+            event_dict = event_to_dict(event, display_tags)
+            if export_format == 'csv':
+                writer.writerow(_csv_row(event_dict))
             else:
-                query = query.order_by(getattr(Event, sort_by))
-
-        # Get unique events (due to the join with dates)
-        event_ids = [event.id for event in query.distinct(Event.id)]
-
-        # Fetch complete events with their dates and tags
-        events = []
-        for event_id in event_ids:
-            event = session.query(Event).filter(Event.id == event_id).first()
-            if event:
-                event_dict = {
-                    'id': event.id,
-                    'title': event.title,
-                    'description': event.description,
-                    'location': event.location,
-                    'url': event.url,
-                    'media_url': event.media_url,
-                    'archived': event.archived,
-                    'dates': [],
-                    'tags': []  # Add tags to event data
-                }
+                buffer.write(json.dumps(event_dict) + '\n')
+
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+    finally:
+        session.close()
 
-                # Add dates
-                for date in event.dates:
-                    date_dict = {
-                        'id': date.id,
-                        'date': date.date.isoformat() if date.date else None,
-                        'time': date.time,
-                        'end_date': date.end_date.isoformat() if date.end_date else None,
-                        'end_time': date.end_time
-                    }
-                    event_dict['dates'].append(date_dict)
-
-                # Add tags
-                for tag in event.tags:
-                    display_name = db_manager.get_mapping_for_tag(tag.name)
-                    event_dict['tags'].append({
-                        'id': tag.id,
-                        'name': tag.name,
-                        'display_name': display_name
-                    })
-
-                events.append(event_dict)
-
-        return jsonify(events)
 
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@app.route('/api/events/export')
+def export_events():
+    """
+    Stream all matching events as NDJSON or CSV.
+
+    Takes the same filter and sort arguments as /api/events. Events are read
+    with a server-side cursor in batches and written as they are read, so
+    memory use does not grow with the number of events. The response is
+    gzip-compressed when the client accepts it or asks for it with gzip=true.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unknown export format '{export_format}'"}), 400
+
+    session = Session()
+    try:
+        filtered, rank = filter_events(session, request.args)
+        query, _ = sort_events(filtered, request.args, rank)
+        query = query.options(selectinload(Event.dates), selectinload(Event.tags))
+    except ValueError as e:
+        session.close()
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
+        session.close()
         return jsonify({'error': str(e)}), 500
 
-    finally:
-        session.close()
+    # The generator owns the session from here on and closes it when the response ends
+    chunks = _export_lines(session, query, export_format)
+    headers = {'Content-Disposition': f'attachment; filename=events.{export_format}', 'Vary': 'Accept-Encoding'}
+    # The quality counts: "gzip;q=0" refuses gzip
+    if request.args.get('gzip', '').lower() == 'true' or request.accept_encodings['gzip'] > 0:
+        chunks = _gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return app.response_class(chunks, mimetype=EXPORT_FORMATS[export_format], headers=headers)
 
 
 @app.route('/api/events/<int:event_id>', methods=['DELETE'])
@@ -177,6 +517,7 @@ def delete_event(event_id):
 
         session.delete(event)
         session.commit()
+        response_cache.invalidate()
         return jsonify({'success': True})
 
     except Exception as e:
@@ -198,6 +539,7 @@ def archive_event(event_id):
 
         event.archived = True
         session.commit()
+        response_cache.invalidate()
         return jsonify({'success': True})
 
     except Exception as e:
@@ -220,6 +562,7 @@ def bulk_delete_events():
         # Delete events
         deleted_count = session.query(Event).filter(Event.id.in_(event_ids)).delete(synchronize_session='fetch')
         session.commit()
+        response_cache.invalidate()
 
         return jsonify({'success': True, 'deleted_count': deleted_count})
 
@@ -249,6 +592,7 @@ def bulk_archive_events():
             archived_count += 1
 
         session.commit()
+        response_cache.invalidate()
 
         return jsonify({'success': True, 'archived_count': archived_count})
 
@@ -263,6 +607,9 @@ def bulk_archive_events():
 @app.route('/api/events/export-calendar', methods=['POST'])
 def export_to_calendar():
     """Export selected events to Google Calendar."""
+    # The Google client libraries are only needed here, not to serve the event list
+    from calendar_service import create_calendar_event, setup_credentials
+
     session = Session()
     try:
         event_ids = request.json.get('event_ids', [])
@@ -316,31 +663,25 @@ def export_to_calendar():
 
 
 @app.route('/api/parser-health')
+@versioned
 def get_parser_health():
     """Get the health status of all parsers."""
     session = Session()
     try:
-        # Simpler query that just gets the latest record for each parser
-        parser_records = {}
-
-        # Get all records
-        all_records = session.query(ParserHealth).order_by(ParserHealth.last_run.desc()).all()
-
-        # Keep only the latest record for each parser
-        for record in all_records:
-            if record.parser_name not in parser_records:
-                parser_records[record.parser_name] = record
-
-        # Convert to dictionary for JSON response
+        # One row per parser, kept up to date by every run
         health_data = []
-        for parser_name, record in parser_records.items():
+        for record in session.query(ParserStatus).order_by(ParserStatus.parser_name):
             health_data.append({
                 'parser_name': record.parser_name,
                 'display_name': record.display_name or record.parser_name,  # Use display_name if available
                 'last_run': record.last_run.isoformat() if record.last_run else None,
+                'last_success': record.last_success.isoformat() if record.last_success else None,
                 'success': record.success,
                 'events_parsed': record.events_parsed,
-                'error_message': record.error_message
+                'error_message': record.error_message,
+                'cache_hits': record.cache_hits or 0,
+                'cache_misses': record.cache_misses or 0,
+                'duration_seconds': record.duration_seconds
             })
 
         return jsonify({'parser_health': health_data})
@@ -354,14 +695,29 @@ def get_parser_health():
         session.close()
 
 
+@app.route('/api/parser-health/history')
+def get_parser_health_history():
+    """Get daily run statistics per parser."""
+    session = Session()
+    try:
+        days = request.args.get('days', 30, type=int)
+        parser_name = request.args.get('parser')
+        return jsonify({'history': daily_summaries(session, days=days, parser_name=parser_name)})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    finally:
+        session.close()
+
+
 @app.route('/api/parser-health/error-details/<string:parser_name>')
 def get_parser_error_details(parser_name):
     """Get the detailed error message for a parser."""
     session = Session()
     try:
         # Get the latest record for the specified parser
-        record = session.query(ParserHealth).filter_by(parser_name=parser_name) \
-            .order_by(ParserHealth.last_run.desc()).first()
+        record = session.get(ParserStatus, parser_name)
 
         if not record:
             return jsonify({'error': 'Parser record not found'}), 404
@@ -381,18 +737,20 @@ def get_parser_error_details(parser_name):
 
 
 @app.route('/api/tags')
+@versioned
+@cached
 def get_tags():
     session = Session()
-    db_manager = DBManager(DATABASE_URL)
     try:
         tags = session.query(Tag).order_by(Tag.name).all()
+        mappings = get_display_tags(session)
         tag_list = []
 
         # Group tags by display name
         display_tags = {}
 
         for tag in tags:
-            display_name = db_manager.get_mapping_for_tag(tag.name)
+            display_name = mappings.get(tag.name, tag.name)
 
             if display_name not in display_tags:
                 display_tags[display_name] = {
@@ -413,10 +771,10 @@ def get_tags():
         return jsonify({'error': str(e)}), 500
     finally:
         session.close()
-        db_manager.close()
 
 
 @app.route('/api/tags/mappings', methods=['GET'])
+@versioned
 def get_tag_mappings():
     """Get all tag mappings."""
     db_manager = DBManager(DATABASE_URL)
@@ -443,6 +801,7 @@ def create_tag_mapping():
             return jsonify({'error': 'Missing source_tag or display_tag'}), 400
 
         mapping = db_manager.set_tag_mapping(source_tag, display_tag)
+        response_cache.invalidate()
         return jsonify({
             'source_tag': mapping.source_tag,
             'display_tag': mapping.display_tag
@@ -459,6 +818,7 @@ def delete_tag_mapping(source_tag):
     db_manager = DBManager(DATABASE_URL)
     try:
         db_manager.remove_tag_mapping(source_tag)
+        response_cache.invalidate()
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -466,5 +826,11 @@ def delete_tag_mapping(source_tag):
         db_manager.close()
 
 
+@app.route('/api/cache-stats')
+def get_cache_stats():
+    """Hit, miss and eviction counts of the response cache."""
+    return jsonify(response_cache.stats())
+
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8080)
\ No newline at end of file
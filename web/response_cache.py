@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of serialized API responses.
+
+    Entries are stamped with the data version they were computed for and only
+    served while it is still current, so a write from any process (e.g. a
+    parser run) invalidates them. Writes through the web interface also clear
+    the cache right away to free the memory. Entries expire after ttl seconds
+    and the least recently used ones are evicted to stay within max_entries
+    and max_bytes.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'evictions': 0, 'invalidations': 0, 'too_large': 0}
+
+    @staticmethod
+    def make_key(path, args):
+        """Cache key of a request: its path and its non-empty arguments in a fixed order."""
+        return (path,) + tuple(sorted((name, value) for name, value in args.items(multi=True) if value != ''))
+
+    def get(self, key, version):
+        """Cached body for a key if it was computed for this data version and has not expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            entry_version, expires, body = entry
+            if entry_version != version or expires <= now:
+                self._remove(key)
+                self._stats['stale'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return body
+
+    def put(self, key, version, body):
+        """Store a body computed for a data version, evicting the least recently used entries if needed."""
+        if len(body) > self.max_bytes:
+            with self._lock:
+                self._stats['too_large'] += 1
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and (len(self._entries) >= self.max_entries or
+                                     self._bytes + len(body) > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+            self._entries[key] = (version, time.monotonic() + self.ttl, body)
+            self._bytes += len(body)
+
+    def invalidate(self):
+        """Drop all entries, e.g. after a write."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats['invalidations'] += 1
+
+    def stats(self):
+        """Hit, miss and eviction counters plus the current size, for sizing the cache."""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return dict(
+                self._stats,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                ttl=self.ttl,
+                hit_rate=self._stats['hits'] / lookups if lookups else 0.0,
+            )
+
+    def _remove(self, key):
+        _, _, body = self._entries.pop(key)
+        self._bytes -= len(body)
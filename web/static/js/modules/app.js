@@ -200,16 +200,12 @@ export class EventManagerApp {
     this.ui.showLoading();
     try {
       const params = this.state.getQueryParams();
+      // Events arrive sorted by the server, including by date
       const events = await this.api.getEvents(params);
 
-      // If sorting by date, sort client-side
-      const sortedEvents = this.state.getSortBy() === 'date'
-        ? this.sortEventsByDate(events)
-        : events;
-
-      this.state.setEvents(sortedEvents);
+      this.state.setEvents(events);
       // Pass the tagManager to renderEvents
-      this.ui.renderEvents(sortedEvents, this.state.getIncludeArchived(), this.tagManager);
+      this.ui.renderEvents(events, this.state.getIncludeArchived(), this.tagManager);
       this.updateActionButtons();
       this.updateFilterTags();
     } catch (error) {
@@ -220,26 +216,6 @@ export class EventManagerApp {
     }
   }
 
-  /**
-   * Sort events by date
-   * @param {Array} events - Events to sort
-   * @returns {Array} - Sorted events
-   */
-  sortEventsByDate(events) {
-    const sortDirection = this.state.getSortDirection() === 'asc' ? 1 : -1;
-
-    return [...events].sort((a, b) => {
-      const dateA = this.dateUtils.getEventFirstDate(a);
-      const dateB = this.dateUtils.getEventFirstDate(b);
-
-      if (!dateA && !dateB) return 0;
-      if (!dateA) return 1;
-      if (!dateB) return -1;
-
-      return sortDirection * (new Date(dateA) - new Date(dateB));
-    });
-  }
-
   /**
    * Get IDs of selected events
    * @returns {Array<number>} - Selected event IDs